@@ -0,0 +1,56 @@
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+
+from reviews.signals import close_unusable_connections
+
+from .views import CommentViewSet, ReviewViewSet, TitleViewSet
+
+
+def async_read_view(viewset, actions):
+    """Асинхронная обертка над GET-действиями вьюсета.
+
+    Под ASGI синхронные представления Django 3.2 выполняются по очереди в
+    одном общем потоке. Здесь запрос обрабатывается в пуле потоков, у
+    каждого потока свое подключение к базе, поэтому медленные запросы не
+    задерживают остальные. Ответ отдается уже отрендеренным, без повторного
+    перехода в общий поток. Асинхронного ORM в Django 3.2 нет.
+    """
+    view = viewset.as_view(actions)
+
+    def handle(request, *args, **kwargs):
+        # Подключения потоков пула обслуживаются так же, как в
+        # request_started/request_finished для синхронных запросов.
+        close_old_connections()
+        close_unusable_connections(sender=viewset)
+        try:
+            response = view(request, *args, **kwargs)
+            # Ответы из кеша и 304 уже готовы, рендерить нужно только
+            # ответы DRF.
+            if not isinstance(response, SimpleTemplateResponse):
+                return response
+            response.render()
+            return HttpResponse(
+                response.content,
+                status=response.status_code,
+                headers=dict(response.items()),
+            )
+        finally:
+            close_old_connections()
+
+    handle = sync_to_async(handle, thread_sensitive=False)
+
+    async def async_view(request, *args, **kwargs):
+        return await handle(request, *args, **kwargs)
+
+    async_view.csrf_exempt = True
+    return async_view
+
+
+title_list = async_read_view(TitleViewSet, {'get': 'list'})
+title_detail = async_read_view(TitleViewSet, {'get': 'retrieve'})
+review_list = async_read_view(ReviewViewSet, {'get': 'list'})
+review_detail = async_read_view(ReviewViewSet, {'get': 'retrieve'})
+comment_list = async_read_view(CommentViewSet, {'get': 'list'})
+comment_detail = async_read_view(CommentViewSet, {'get': 'retrieve'})
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from reviews.models import User
+
+# Только поля, при изменении которых растет auth_version. Имя можно сменить
+# без отзыва токена, поэтому оно загружается из базы при обращении.
+USER_CLAIMS = ('role', 'is_staff', 'is_superuser')
+VERSION_CLAIM = 'auth_version'
+MISSING_USER = -1
+
+
+def auth_version_cache_key(user_id):
+    return f'auth-version:{user_id}'
+
+
+def get_auth_version(user_id):
+    """Текущая версия прав пользователя, кешируется на короткое время."""
+    key = auth_version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('auth_version', flat=True).first()
+        if version is None:
+            version = MISSING_USER
+        cache.set(key, version, settings.AUTH_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """Токен, в который записаны роль и версия прав пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[VERSION_CLAIM] = user.auth_version
+        return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Аутентификация по JWT без запроса пользователя из базы.
+
+    Пользователь собирается из данных токена; остальные поля загружаются
+    из базы только при обращении к ним. Токен отклоняется, если с момента
+    выдачи у пользователя изменились права. Токены без данных
+    пользователя проверяются как раньше, запросом к базе.
+    """
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if validated_token[VERSION_CLAIM] != get_auth_version(user_id):
+            raise AuthenticationFailed(
+                'Токен отозван', code='token_revoked'
+            )
+        values = {
+            claim: validated_token[claim]
+            for claim in (*USER_CLAIMS, VERSION_CLAIM)
+        }
+        values['id'] = user_id
+        # from_db ожидает значения в порядке полей модели.
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            router.db_for_read(User),
+            field_names,
+            [values[name] for name in field_names],
+        )
@@ -0,0 +1,66 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def version_key(namespace):
+    return f'api-version:{namespace}'
+
+
+def get_versions(namespaces):
+    """Версии пространств имен; отсутствующие заводятся заново.
+
+    Версия — время последнего изменения в наносекундах, поэтому после
+    вытеснения из кеша она не совпадет ни с одной выданной ранее.
+    """
+    cache = get_cache()
+    keys = [version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, None)
+        versions.update(cache.get_many(missing))
+    return [versions[key] for key in keys]
+
+
+def touch(*namespaces):
+    """Помечает данные пространств имен измененными."""
+    now = time.time_ns()
+    get_cache().set_many(
+        {version_key(namespace): now for namespace in namespaces}, None
+    )
+
+
+def request_digest(request, versions):
+    """Хеш запроса и версий данных; служит и ключом кеша, и ETag."""
+    query = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    source = '|'.join((
+        request.scheme,
+        request.get_host(),
+        request.path,
+        repr(query),
+        request.accepted_renderer.format,
+        repr(versions),
+    ))
+    return hashlib.md5(source.encode()).hexdigest()
+
+
+def response_key(digest, replica=False):
+    """Ответы, прочитанные из реплик, хранятся отдельно от ответов
+    основной базы.
+    """
+    if replica:
+        return f'api-replica-response:{digest}'
+    return f'api-response:{digest}'
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def get_encoders():
+    """Доступные кодировки в порядке предпочтения."""
+    encoders = {}
+    if brotli is not None:
+        encoders['br'] = brotli.compress
+    encoders['gzip'] = compress_string
+    return encoders
+
+
+def negotiate(request):
+    """Лучшая из доступных кодировок, принимаемых клиентом, или None."""
+    accepted = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in get_encoders():
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content):
+    return len(content) >= settings.RESPONSE_COMPRESSION_MIN_SIZE
+
+
+def compress(content, encoding):
+    return get_encoders()[encoding](content)
+
+
+def set_encoded_content(response, content, encoding):
+    """Подменяет тело ответа сжатым и выставляет заголовки."""
+    response.content = content
+    response['Content-Encoding'] = encoding
+    if response.has_header('Content-Length'):
+        response['Content-Length'] = str(len(content))
+    # Сжатое тело побайтно отличается от исходного, как и в GZipMiddleware.
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = f'W/{etag}'
+    patch_vary_headers(response, ('Accept-Encoding',))
@@ -1,5 +1,8 @@
 from django_filters import CharFilter, FilterSet
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
 
+from .search import get_search_backend
 from reviews.models import Title
 
 
@@ -14,10 +17,33 @@ class TitleFilter(FilterSet):
         field_name='year'
     )
     name = CharFilter(
-        field_name='name',
-        lookup_expr='contains'
+        method='filter_name'
     )
 
     class Meta:
         model = Title
         fields = '__all__'
+
+    def filter_name(self, queryset, name, value):
+        return get_search_backend().filter_name(queryset, value)
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск `?search=` с сортировкой по релевантности."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        # Курсорная пагинация сортирует по своему ключу, а не по
+        # релевантности.
+        paginator = getattr(view, 'paginator', None)
+        if paginator is not None and paginator.is_cursor_mode(request):
+            raise ValidationError({
+                self.search_param: [
+                    'Поиск не поддерживает курсорную пагинацию.'
+                ]
+            })
+        return get_search_backend().search(queryset, query)
@@ -0,0 +1,28 @@
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import (compress, is_compressible, negotiate,
+                          set_encoded_content)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжимает ответы не короче RESPONSE_COMPRESSION_MIN_SIZE байт.
+
+    Кодировка (brotli, если установлен, или gzip) выбирается по
+    Accept-Encoding. Уже сжатые ответы, например взятые из кеша API,
+    не трогает.
+    """
+
+    def process_response(self, request, response):
+        if (response.streaming
+                or response.has_header('Content-Encoding')
+                or not is_compressible(response.content)):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request)
+        if encoding is None:
+            return response
+        content = compress(response.content, encoding)
+        if len(content) < len(response.content):
+            set_encoded_content(response, content, encoding)
+        return response
@@ -1,8 +1,266 @@
+from itertools import chain
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_etags, quote_etag
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from .cache import get_cache, get_versions, request_digest, response_key
+from .compression import (compress, is_compressible, negotiate,
+                          set_encoded_content)
+from .routers import (is_pinned_to_primary, pin_to_primary,
+                      reads_from_replica, use_replica)
+from .serializers import DynamicFieldsMixin
+
 
 class CreateDestroyListMixin(CreateModelMixin, DestroyModelMixin,
                              ListModelMixin, GenericViewSet):
     ...
+
+
+class CachedResponseMixin:
+    """Кеширует JSON-ответы на запросы списка до изменения данных.
+
+    Ключ строится по адресу, параметрам запроса и версиям пространств
+    имен из `get_cache_namespaces`; версии обновляются сигналами
+    моделей (см. api/signals.py). По тем же версиям вычисляются ETag и
+    Last-Modified, поэтому на условный запрос с неизменными данными
+    возвращается 304 без обращения к базе и сериализаторам.
+    """
+
+    cache_namespaces = ()
+
+    def get_cache_namespaces(self):
+        return self.cache_namespaces
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, view, request, *args, **kwargs):
+        versions = get_versions(self.get_cache_namespaces())
+        digest = request_digest(request, versions)
+        validators = {
+            'etag': quote_etag(digest),
+            # Версия — время изменения в наносекундах.
+            'last_modified': max(versions, default=0) // 10 ** 9,
+        }
+        response = get_conditional_response(request, **validators)
+        if response is not None and not self.etag_matched(
+            request, validators['etag']
+        ):
+            self.check_resource_exists()
+        if response is None and reads_from_replica():
+            # Реплика может отставать от версий, которые уже обновила
+            # запись. Такой ответ хранится отдельно от ответов основной
+            # базы на время допустимого отставания реплик и не получает
+            # валидаторов, чтобы 304 не продлевал устаревшие данные.
+            response = self.fresh_response(
+                view, request, response_key(digest, replica=True),
+                settings.REPLICA_STICKY_SECONDS, *args, **kwargs
+            )
+            patch_cache_control(response, no_cache=True)
+            return response
+        if response is None:
+            response = self.fresh_response(
+                view, request, response_key(digest),
+                settings.API_CACHE_TIMEOUT, *args, **kwargs
+            )
+        if response.status_code in (200, 304):
+            response['ETag'] = validators['etag']
+            if response.has_header('Content-Encoding'):
+                response['ETag'] = f'W/{validators["etag"]}'
+            response['Last-Modified'] = http_date(
+                validators['last_modified']
+            )
+            patch_cache_control(response, no_cache=True)
+        return response
+
+    def etag_matched(self, request, etag):
+        """Клиент прислал ETag, выданный на этот адрес при тех же версиях.
+
+        Такой ресурс существовал, а его удаление обновило бы версии.
+        На `*` и If-Modified-Since 304 подошел бы и к несуществующему.
+        """
+        etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        return etag in etags or f'W/{etag}' in etags
+
+    def check_resource_exists(self):
+        """Ответ 404, если нет объекта или родительского ресурса."""
+        if (self.lookup_url_kwarg or self.lookup_field) in self.kwargs:
+            self.get_object()
+        else:
+            self.get_queryset()
+
+    def fresh_response(self, view, request, key, timeout, *args, **kwargs):
+        """Ответ из кеша или от `view`; тела хранятся и в сжатом виде,
+        чтобы не сжимать их заново при каждом обращении.
+        """
+        if request.accepted_renderer.format != 'json':
+            return view(request, *args, **kwargs)
+        cache = get_cache()
+        encoding = negotiate(request)
+        cached = cache.get(key)
+        if cached is not None:
+            bodies, content_type = cached
+            response = HttpResponse(bodies[None], content_type=content_type)
+            if encoding and is_compressible(bodies[None]):
+                if encoding not in bodies:
+                    bodies[encoding] = compress(bodies[None], encoding)
+                    cache.set(key, cached, timeout)
+                set_encoded_content(response, bodies[encoding], encoding)
+            return response
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            def store(rendered):
+                bodies = {None: rendered.content}
+                if encoding and is_compressible(rendered.content):
+                    bodies[encoding] = compress(rendered.content, encoding)
+                    set_encoded_content(rendered, bodies[encoding], encoding)
+                cache.set(
+                    key,
+                    (bodies, rendered['Content-Type']),
+                    timeout
+                )
+            response.add_post_render_callback(store)
+        return response
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    """Кеширует также ответы на запросы отдельного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class SparseFieldsetMixin:
+    """Параметры `?fields=` и `?exclude=` для GET-запросов.
+
+    Сериализатор выводит только выбранные поля, а queryset загружает
+    только нужные им колонки через `only()` и не выполняет лишние
+    select_related и prefetch_related.
+    """
+
+    sparse_params = ('fields', 'exclude')
+
+    def get_sparse_fieldset(self):
+        if self.request.method != 'GET':
+            return {}
+        return {
+            param: [
+                name.strip()
+                for name in self.request.query_params[param].split(',')
+                if name.strip()
+            ]
+            for param in self.sparse_params
+            if param in self.request.query_params
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(), DynamicFieldsMixin):
+            kwargs.update(self.get_sparse_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_base_queryset(self):
+        """Queryset до отбора колонок; вложенные вьюсеты переопределяют
+        этот метод, а не get_queryset.
+        """
+        return super().get_queryset()
+
+    def get_queryset(self):
+        queryset = self.get_base_queryset()
+        fieldset = self.get_sparse_fieldset()
+        serializer_class = self.get_serializer_class()
+        if not fieldset or not issubclass(
+            serializer_class, DynamicFieldsMixin
+        ):
+            return queryset
+        attrs = serializer_class(**fieldset).get_source_attrs()
+        if attrs is None:
+            return queryset
+        return self.trim_queryset(queryset, attrs)
+
+    def trim_queryset(self, queryset, attrs):
+        meta = queryset.model._meta
+        attrs = attrs | {
+            name.lstrip('-')
+            for name in chain(
+                queryset.query.order_by,
+                getattr(self.paginator, 'ordering', None) or (),
+            )
+        }
+        prefetches = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if str(lookup).split('__')[0] in attrs
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(
+            *prefetches
+        )
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            related = [name for name in select_related if name in attrs]
+            queryset = queryset.select_related(None)
+            if related:
+                queryset = queryset.select_related(*related)
+        concrete = {field.name for field in meta.concrete_fields}
+        return queryset.only(*(attrs & concrete))
+
+
+class ValuesListMixin(SparseFieldsetMixin):
+    """Отдает списки через `values_serializer_class` (без объектов моделей).
+
+    Колонки сортировки пагинатора добавляются в строки, чтобы курсорная
+    пагинация могла построить ссылку на следующую страницу.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.values_serializer_class(
+            **self.get_sparse_fieldset()
+        )
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        rows = serializer.get_values(
+            self.filter_queryset(self.get_queryset()),
+            [name.lstrip('-') for name in ordering]
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(rows))
+
+
+class ReplicaReadMixin:
+    """Читает из реплик при безопасных запросах.
+
+    После успешной записи пользователь на время REPLICA_STICKY_SECONDS
+    читает из основной базы, чтобы сразу видеть свои изменения.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = use_replica.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            use_replica.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (request.method in SAFE_METHODS
+                and not is_pinned_to_primary(request.user)):
+            use_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (request.method not in SAFE_METHODS
+                and response.status_code < 400
+                and request.user.is_authenticated):
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
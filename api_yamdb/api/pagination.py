@@ -0,0 +1,53 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """Постраничная пагинация с необязательным курсорным режимом.
+
+    Курсорный режим включается параметром `pagination=cursor` и не
+    выполняет COUNT(*) и OFFSET: следующая страница выбирается по
+    ключу сортировки `ordering`.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    ordering = None
+
+    cursor_paginator = None
+
+    def is_cursor_mode(self, request):
+        return request.query_params.get(
+            self.mode_query_param
+        ) == self.cursor_mode
+
+    def get_cursor_paginator(self):
+        paginator = CursorPagination()
+        paginator.ordering = self.ordering
+        paginator.page_size = self.page_size
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_mode(request):
+            self.cursor_paginator = self.get_cursor_paginator()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+
+
+class TitlePagination(PageNumberOrCursorPagination):
+    ordering = ('name', 'id')
+
+
+class ReviewCommentPagination(PageNumberOrCursorPagination):
+    ordering = ('-pub_date', '-id')
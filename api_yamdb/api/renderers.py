@@ -0,0 +1,45 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если библиотека установлена.
+
+    Вывод совпадает с JSONRenderer: компактный UTF-8, даты и прочие
+    нестандартные типы кодируются `encoder_class`. Запросы с отступами
+    (браузерный API, `indent=` в Accept) и настройки, которые orjson не
+    поддерживает, обрабатываются стандартным json.
+    """
+
+    def use_orjson(self, data, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and data is not None
+            and self.compact
+            and self.strict
+            and not self.ensure_ascii
+            and not self.get_indent(accepted_media_type, renderer_context)
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not self.use_orjson(
+            data, accepted_media_type, renderer_context or {}
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        content = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+        # Как и JSONRenderer, экранирует символы, недопустимые в JavaScript.
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(
+                b'\xe2\x80\xa8', b'\\u2028'
+            ).replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
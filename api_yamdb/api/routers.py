@@ -0,0 +1,63 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .cache import get_cache
+
+# Включается на время безопасных запросов к вьюсетам с ReplicaReadMixin.
+use_replica = ContextVar('use_replica', default=False)
+
+
+def primary_pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def pin_to_primary(user):
+    """После записи пользователь читает с основной базы, пока реплики
+    не догонят ее (REPLICA_STICKY_SECONDS).
+    """
+    get_cache().set(
+        primary_pin_key(user.pk), True, settings.REPLICA_STICKY_SECONDS
+    )
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and bool(
+        get_cache().get(primary_pin_key(user.pk))
+    )
+
+
+def reads_from_replica():
+    return use_replica.get() and bool(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    """Направляет чтение в реплики из DATABASE_REPLICAS, если оно разрешено
+    для текущего запроса; запись всегда идет в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        if reads_from_replica():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        # Объекты, прочитанные из реплики, сохраняются в основную базу;
+        # для остальных баз выбор остается за Django.
+        instance = hints.get('instance')
+        if instance is None:
+            return 'default'
+        if instance._state.db in settings.DATABASE_REPLICAS:
+            return 'default'
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики получают схему вместе с данными основной базы.
+        return db not in settings.DATABASE_REPLICAS
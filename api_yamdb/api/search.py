@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+
+class SearchBackend:
+    """Поиск произведений без полнотекстового индекса.
+
+    Подходит для любой базы, но каждый запрос просматривает всю таблицу;
+    для конкретной СУБД подключается подкласс через
+    `TITLE_SEARCH_BACKENDS`.
+    """
+
+    def is_available(self, connection):
+        return True
+
+    def filter_name(self, queryset, value):
+        """Произведения, в названии которых есть подстрока `value`."""
+        return queryset.filter(name__contains=value)
+
+    def search(self, queryset, query):
+        """Произведения, содержащие все слова запроса, от более к менее
+        релевантным.
+        """
+        for term in query.split():
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Поиск по FTS5-таблице reviews_title_fts (миграция 0007).
+
+    Триграммный индекс находит слова, начинающиеся с запроса или
+    содержащие его, если в нем не меньше трех символов; более короткие
+    слова ищутся обычным LIKE среди уже найденных по индексу строк.
+    Релевантность — bm25, совпадение в названии весит больше, чем
+    в описании. Если миграция не создала таблицу (SQLite без FTS5 или
+    триграммного токенизатора), используется SearchBackend.
+    """
+
+    table = 'reviews_title_fts'
+    min_term_length = 3
+    weights = (10.0, 1.0)
+    # Есть ли таблица индекса, по имени базы; проверяется один раз.
+    available = {}
+
+    def is_available(self, connection):
+        name = str(connection.settings_dict['NAME'])
+        if name not in self.available:
+            self.available[name] = (
+                self.table in connection.introspection.table_names()
+            )
+        return self.available[name]
+
+    def split(self, terms):
+        indexed = [term for term in terms if len(term) >= self.min_term_length]
+        return indexed, [term for term in terms if term not in indexed]
+
+    def match_expression(self, terms):
+        return ' AND '.join(
+            '"{}"'.format(term.replace('"', '""')) for term in terms
+        )
+
+    def matching_ids(self, expression):
+        return RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+            (expression,)
+        )
+
+    def filter_name(self, queryset, value):
+        if len(value) < self.min_term_length:
+            return super().filter_name(queryset, value)
+        # Индекс отбирает кандидатов без учета регистра, точное условие
+        # проверяется уже только на них.
+        return super().filter_name(
+            queryset.filter(
+                pk__in=self.matching_ids(
+                    f'name : {self.match_expression([value])}'
+                )
+            ),
+            value
+        )
+
+    def search(self, queryset, query):
+        indexed, short = self.split(query.split())
+        if not indexed:
+            return super().search(queryset, query)
+        expression = self.match_expression(indexed)
+        weights = ', '.join(str(weight) for weight in self.weights)
+        queryset = queryset.filter(
+            pk__in=self.matching_ids(expression)
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT bm25({self.table}, {weights}) FROM {self.table} '
+                f'WHERE {self.table} MATCH %s '
+                f'AND rowid = {queryset.model._meta.db_table}.id',
+                (expression,)
+            )
+        ).order_by('search_rank', *queryset.query.order_by)
+        return super().search(queryset, ' '.join(short))
+
+
+def get_search_backend():
+    path = settings.TITLE_SEARCH_BACKENDS.get(
+        connection.vendor, 'api.search.SearchBackend'
+    )
+    backend = import_string(path)()
+    if not backend.is_available(connection):
+        return SearchBackend()
+    return backend
@@ -1,12 +1,47 @@
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
 from reviews.constants import EMAIL_MAX_LENGTH, USERNAME_MAX_LENGTH
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleStatistics, User)
 from reviews.validators import validate_username
 
 
-class UserSerializer(serializers.ModelSerializer):
+class DynamicFieldsMixin:
+    """Оставляет в ответе поля из `fields` и убирает поля из `exclude`.
+
+    `field_sources` перечисляет атрибуты модели, из которых вычисляется
+    поле, если это не одноименный атрибут (например, свойство модели).
+    """
+
+    field_sources = {}
+
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        unknown = set(fields or ()).union(exclude or ()) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': [
+                    f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+                ]
+            })
+        for name in list(self.fields):
+            if (fields is not None and name not in fields
+                    or exclude is not None and name in exclude):
+                self.fields.pop(name)
+
+    def get_source_attrs(self):
+        """Атрибуты модели, нужные выбранным полям, или None, если все."""
+        attrs = set()
+        for name, field in self.fields.items():
+            if field.source == '*':
+                return None
+            attrs.update(
+                self.field_sources.get(name, (field.source.split('.')[0],))
+            )
+        return attrs
+
+
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = User
@@ -34,14 +69,14 @@ class TokenSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField()
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Category
         exclude = ('id',)
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Genre
@@ -61,11 +96,13 @@ class TitlePOSTSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'year', 'description', 'genre', 'category')
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer(many=False, required=False)
     genre = GenreSerializer(many=True, required=False)
     rating = serializers.IntegerField()
 
+    field_sources = {'rating': ('rating_sum', 'rating_count')}
+
     class Meta:
         model = Title
         fields = (
@@ -80,7 +117,20 @@ class TitleSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleStatisticsSerializer(serializers.ModelSerializer):
+    reviews = serializers.IntegerField(source='review_count')
+    comments = serializers.IntegerField(source='comment_count')
+    rating = serializers.IntegerField(source='title.rating')
+    scores = serializers.DictField(
+        child=serializers.IntegerField(), source='histogram'
+    )
+
+    class Meta:
+        model = TitleStatistics
+        fields = ('reviews', 'comments', 'rating', 'scores')
+
+
+class ReviewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True
@@ -91,18 +141,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         read_only_fields = ('title',)
 
-    def validate(self, data):
-        if not self.context.get('request').method == 'POST':
-            return data
-        title_id = self.context['view'].kwargs.get('title_id')
-        author = self.context.get('request').user
-        title = get_object_or_404(Title, id=title_id)
-        if title.reviews.filter(author=author).exists():
-            raise serializers.ValidationError(
-                'Можно оставлять только один отзыв!'
-            )
-        return data
-
     def validate_score(self, value):
         if value < 1 or value > 10:
             raise serializers.ValidationError(
@@ -112,7 +150,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         return value
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
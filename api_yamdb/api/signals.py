@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import auth_version_cache_key
+from .cache import touch
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.signals import csv_imported
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def reset_auth_version(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: cache.delete(auth_version_cache_key(instance.pk))
+    )
+
+
+def touch_on_commit(*namespaces):
+    transaction.on_commit(lambda: touch(*namespaces))
+
+
+@receiver(post_save, sender=User)
+def touch_users(sender, instance, created, **kwargs):
+    """Сбрасывает списки отзывов и комментариев при смене имени автора.
+
+    У нового пользователя их еще нет, а при удалении они удаляются
+    каскадно и сбрасываются своими сигналами.
+    """
+    stored = getattr(instance, '_stored_username', None)
+    if not created and stored != instance.username:
+        touch_on_commit('users')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def touch_categories(sender, instance, **kwargs):
+    touch_on_commit('categories')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def touch_genres(sender, instance, **kwargs):
+    touch_on_commit('genres')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def touch_title(sender, instance, **kwargs):
+    touch_on_commit('titles', f'title:{instance.pk}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_genres(sender, instance, action, pk_set, **kwargs):
+    if isinstance(instance, Title):
+        if action.startswith('post_'):
+            touch_on_commit('titles', f'title:{instance.pk}')
+        return
+    # post_clear со стороны жанра не передает pk_set, поэтому
+    # произведения запоминаются до очистки.
+    if action == 'pre_clear':
+        instance._cleared_title_ids = list(
+            Title.objects.filter(genre=instance).values_list('pk', flat=True)
+        )
+    elif action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_title_ids', ())
+    if action.startswith('post_'):
+        touch_on_commit('titles', *(f'title:{pk}' for pk in pk_set or ()))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def touch_review_title(sender, instance, **kwargs):
+    touch_on_commit(
+        'titles', f'title:{instance.title_id}', f'reviews:{instance.title_id}'
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_review_comments(sender, instance, **kwargs):
+    touch_on_commit(f'comments:{instance.review_id}')
+
+
+@receiver(csv_imported)
+def touch_imported(sender, models, titles, reviews, **kwargs):
+    namespaces = [
+        namespace for model, namespace in (
+            (User, 'users'), (Category, 'categories'), (Genre, 'genres'),
+        )
+        if model in models
+    ]
+    if titles:
+        namespaces.append('titles')
+    namespaces += [f'title:{pk}' for pk in titles]
+    namespaces += [f'reviews:{pk}' for pk in titles]
+    namespaces += [f'comments:{pk}' for pk in reviews]
+    if namespaces:
+        touch_on_commit(*namespaces)
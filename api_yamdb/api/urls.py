@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
                     ReviewViewSet, TitleViewSet, UserViewSet, generate_token,
                     signup)
@@ -22,7 +23,22 @@ auth_urlpatterns = [
     path('token/', generate_token, name='generate_token'),
 ]
 
+# Те же GET-запросы, обработанные асинхронными представлениями.
+async_urlpatterns = [
+    path('titles/', async_views.title_list, name='titles-list'),
+    path('titles/<int:pk>/', async_views.title_detail, name='titles-detail'),
+    path('titles/<int:title_id>/reviews/', async_views.review_list,
+         name='reviews-list'),
+    path('titles/<int:title_id>/reviews/<int:pk>/',
+         async_views.review_detail, name='reviews-detail'),
+    path('titles/<int:title_id>/reviews/<int:review_id>/comments/',
+         async_views.comment_list, name='comments-list'),
+    path('titles/<int:title_id>/reviews/<int:review_id>/comments/<int:pk>/',
+         async_views.comment_detail, name='comments-detail'),
+]
+
 urlpatterns = [
     path('v1/', include(router.urls)),
+    path('v1/async/', include((async_urlpatterns, 'async'))),
     path('v1/auth/', include(auth_urlpatterns)),
 ]
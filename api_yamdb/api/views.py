@@ -1,9 +1,8 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, api_view
@@ -11,20 +10,29 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-
-from .filters import TitleFilter
-from .mixins import CreateDestroyListMixin
+from rest_framework.settings import api_settings
+
+from .authentication import UserClaimsRefreshToken
+from .filters import TitleFilter, TitleSearchFilter
+from .mixins import (CachedResponseMixin, CachedRetrieveMixin,
+                     CreateDestroyListMixin, ReplicaReadMixin,
+                     SparseFieldsetMixin, ValuesListMixin)
+from .pagination import ReviewCommentPagination, TitlePagination
 from .permissions import (IsAdmin, IsAdminOrReadOnly,
                           IsAuthorAdminModerOrReadOnly)
+from .readonly_serializers import (CommentValuesSerializer,
+                                   ReviewValuesSerializer,
+                                   TitleValuesSerializer)
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, RegistrationSerializer,
                           ReviewSerializer, TitlePOSTSerializer,
-                          TitleSerializer, TokenSerializer, UserSerializer)
-from reviews.models import Category, Genre, Review, Title, User
+                          TitleSerializer, TitleStatisticsSerializer,
+                          TokenSerializer, UserSerializer)
+from reviews.models import (Category, Genre, OutgoingEmail, Review, Title,
+                            TitleStatistics, User)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Вьюсет для получения пользователя."""
 
     queryset = User.objects.all()
@@ -41,6 +49,8 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated]
     )
     def me(self, request):
+        if request.user.get_deferred_fields():
+            request.user.refresh_from_db()
         if request.method == 'GET':
             serializer = UserSerializer(request.user)
             return Response(serializer.data)
@@ -66,25 +76,26 @@ def signup(request):
     username = serializer.validated_data.get('username')
     email = serializer.validated_data.get('email')
 
-    try:
-        user, created = User.objects.get_or_create(
-            username=username,
-            email=email
-        )
-    except IntegrityError:
-        raise ValidationError(
-            'Данное имя пользователя (username) или email уже есть в базе!',
-            status.HTTP_400_BAD_REQUEST
+    with transaction.atomic():
+        try:
+            user, created = User.objects.get_or_create(
+                username=username,
+                email=email
+            )
+        except IntegrityError:
+            raise ValidationError(
+                'Данное имя пользователя (username) или email '
+                'уже есть в базе!',
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        confirmation_code = default_token_generator.make_token(user)
+        OutgoingEmail.objects.create(
+            subject='Код подтверждения для YaMDb',
+            message=f'Код подтверждения: {confirmation_code}',
+            from_email=settings.DEFAULT_EMAIL_TO_SEND_FROM,
+            recipient=user.email,
         )
-
-    confirmation_code = default_token_generator.make_token(user)
-    send_mail(
-        subject='Код подтверждения для YaMDb',
-        message=f'Код подтверждения: {confirmation_code}',
-        from_email=settings.DEFAULT_EMAIL_TO_SEND_FROM,
-        recipient_list=[user.email],
-        fail_silently=False,
-    )
     return Response(data=serializer.data, status=status.HTTP_200_OK)
 
 
@@ -102,7 +113,7 @@ def generate_token(request):
             data={'error': 'Неверный код подтверждения'},
             status=status.HTTP_400_BAD_REQUEST,
         )
-    token = RefreshToken.for_user(user)
+    token = UserClaimsRefreshToken.for_user(user)
 
     return Response(
         data={
@@ -113,7 +124,8 @@ def generate_token(request):
     )
 
 
-class GenreCategoryBaseViewSet(CreateDestroyListMixin):
+class GenreCategoryBaseViewSet(ReplicaReadMixin, CachedResponseMixin,
+                               SparseFieldsetMixin, CreateDestroyListMixin):
     """Базовый вьюсет для категорий и жанров."""
 
     permission_classes = (IsAdminOrReadOnly,)
@@ -127,6 +139,7 @@ class GenreViewSet(GenreCategoryBaseViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_namespaces = ('genres',)
 
 
 class CategoryViewSet(GenreCategoryBaseViewSet):
@@ -134,50 +147,152 @@ class CategoryViewSet(GenreCategoryBaseViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_namespaces = ('categories',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, CachedRetrieveMixin, ValuesListMixin,
+                   viewsets.ModelViewSet):
     """Вьюсет для получения произведений."""
 
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).order_by(
-        'name'
-    )
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('name')
     serializer_class = TitleSerializer
+    values_serializer_class = TitleValuesSerializer
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilter
+    pagination_class = TitlePagination
+    lookup_value_regex = r'\d+'
+    ids_param = 'ids'
 
     def get_serializer_class(self):
         if self.request.method in ('POST', 'PATCH'):
             return TitlePOSTSerializer
         return TitleSerializer
 
+    @action(detail=True)
+    def stats(self, request, pk=None):
+        """Распределение оценок, число отзывов и комментариев."""
+        title = get_object_or_404(
+            Title.objects.select_related('statistics'), pk=pk
+        )
+        try:
+            statistics = title.statistics
+        except TitleStatistics.DoesNotExist:
+            statistics = TitleStatistics(title=title)
+        return Response(TitleStatisticsSerializer(statistics).data)
+
+    def list(self, request, *args, **kwargs):
+        if self.ids_param in request.query_params:
+            return self.cached_response(
+                self.batch_list, request, *args, **kwargs
+            )
+        return super().list(request, *args, **kwargs)
+
+    def get_requested_ids(self):
+        """Id из `?ids=1,2,3` без повторов, в порядке запроса."""
+        values = self.request.query_params[self.ids_param].split(',')
+        try:
+            ids = [int(value) for value in values if value.strip()]
+        except ValueError:
+            raise ValidationError({
+                self.ids_param: ['Перечислите id произведений через запятую.']
+            })
+        ids = list(dict.fromkeys(ids))
+        if not 0 < len(ids) <= settings.TITLE_BATCH_MAX_IDS:
+            raise ValidationError({
+                self.ids_param: [
+                    'Можно запросить от 1 до '
+                    f'{settings.TITLE_BATCH_MAX_IDS} произведений.'
+                ]
+            })
+        return ids
+
+    def batch_list(self, request, *args, **kwargs):
+        """Произведения из `?ids=` одним запросом, без пагинации.
+
+        Несуществующие id пропускаются, порядок совпадает с запросом.
+        """
+        ids = self.get_requested_ids()
+        serializer = self.values_serializer_class(
+            **self.get_sparse_fieldset()
+        )
+        rows = serializer.get_values(
+            self.filter_queryset(self.get_queryset()).filter(pk__in=ids),
+            ['id']
+        )
+        position = {pk: index for index, pk in enumerate(ids)}
+        rows = sorted(rows, key=lambda row: position[row['id']])
+        return Response(serializer.to_representation(rows))
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_cache_namespaces(self):
+        if self.action == 'retrieve':
+            return (f'title:{self.kwargs["pk"]}', 'genres', 'categories')
+        return ('titles', 'genres', 'categories')
+
+
+class ReviewViewSet(ReplicaReadMixin, CachedRetrieveMixin, ValuesListMixin,
+                    viewsets.ModelViewSet):
     """Вьюсет для получения ревью."""
 
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     permission_classes = [IsAuthorAdminModerOrReadOnly]
+    pagination_class = ReviewCommentPagination
 
-    def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+    @cached_property
+    def title(self):
+        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
 
-    def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+    def get_base_queryset(self):
+        return self.title.reviews.select_related('author')
 
+    def get_cache_namespaces(self):
+        return (f'reviews:{self.kwargs["title_id"]}', 'users')
 
-class CommentViewSet(viewsets.ModelViewSet):
+    def perform_create(self, serializer):
+        try:
+            serializer.save(author=self.request.user, title=self.title)
+        except IntegrityError:
+            # Ошибкой пользователя считается только повторный отзыв.
+            if not self.title.reviews.filter(
+                author=self.request.user
+            ).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Можно оставлять только один отзыв!'
+                ]
+            })
+
+
+class CommentViewSet(ReplicaReadMixin, CachedRetrieveMixin, ValuesListMixin,
+                     viewsets.ModelViewSet):
     """Вьюсет для получения комментариев."""
 
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = [IsAuthorAdminModerOrReadOnly]
+    pagination_class = ReviewCommentPagination
+
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            Review,
+            id=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id')
+        )
+
+    def get_base_queryset(self):
+        return self.review.comments.select_related('author')
 
-    def get_queryset(self):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        return review.comments.all()
+    def get_cache_namespaces(self):
+        return (
+            f'reviews:{self.kwargs["title_id"]}',
+            f'comments:{self.kwargs["review_id"]}',
+            'users',
+        )
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -70,6 +71,52 @@ DATABASES = {
     }
 }
 
+# Реплики только для чтения: файлы SQLite через запятую в
+# DATABASE_REPLICA_FILES (локально их обновляет `manage.py sync_replicas`).
+# Чтение в безопасных запросах к вьюсетам с ReplicaReadMixin уходит в
+# реплики, запись и остальные запросы — в default.
+DATABASE_REPLICAS = []
+for index, name in enumerate(
+        filter(None, os.getenv('DATABASE_REPLICA_FILES', '').split(',')), 1
+):
+    DATABASES[f'replica_{index}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает из основной базы; на столько
+# же кешируются ответы, прочитанные из реплик (без ETag и Last-Modified, так
+# что условные запросы к ним получают 304 только по ETag основной базы).
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 10))
+
+# Постоянные подключения: сколько секунд подключение живет между запросами
+# (0 — закрывается после каждого запроса, none — без ограничения).
+# Перед запросом открытые подключения проверяются и закрываются, если
+# база их уже разорвала (reviews/signals.py).
+CONN_MAX_AGE = os.getenv('DATABASE_CONN_MAX_AGE', '60')
+CONN_MAX_AGE = None if CONN_MAX_AGE.lower() == 'none' else int(CONN_MAX_AGE)
+CONN_HEALTH_CHECKS = os.getenv(
+    'DATABASE_CONN_HEALTH_CHECKS', 'true'
+).lower() in ('1', 'true', 'yes')
+for database in DATABASES.values():
+    database.setdefault('CONN_MAX_AGE', CONN_MAX_AGE)
+    database.setdefault('CONN_HEALTH_CHECKS', CONN_HEALTH_CHECKS)
+
+# PRAGMA, выполняемые при каждом подключении к SQLite (reviews/signals.py).
+# WAL позволяет читать параллельно с записью, busy_timeout (мс) — ждать
+# блокировку вместо ошибки "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -20000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'memory'),
+}
+
 
 # Password validation
 
@@ -113,13 +160,23 @@ AUTH_USER_MODEL = 'reviews.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # JSON на orjson, если он установлен, иначе стандартный json.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 SIMPLE_JWT = {
@@ -128,6 +185,44 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
 
+# Сколько секунд кешируется версия прав пользователя для проверки токенов
+AUTH_VERSION_CACHE_TIMEOUT = 60
+
+# Cache
+
+# Ответы API кешируются в отдельном кеше. Для нескольких процессов
+# нужен общий бэкенд: API_CACHE_BACKEND=
+# django.core.cache.backends.filebased.FileBasedCache и каталог в
+# API_CACHE_LOCATION, либо бэкенд Redis/Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': os.getenv(
+            'API_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('API_CACHE_LOCATION', 'api'),
+    },
+}
+API_CACHE_ALIAS = 'api'
+API_CACHE_TIMEOUT = 300
+
+# Сколько произведений можно запросить за раз через /titles/?ids=
+TITLE_BATCH_MAX_IDS = int(os.getenv('TITLE_BATCH_MAX_IDS', 100))
+
+# Ответы короче этого числа байт не сжимаются
+RESPONSE_COMPRESSION_MIN_SIZE = int(
+    os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+)
+
+# Поиск произведений: класс из api/search.py для каждой СУБД,
+# для остальных используется api.search.SearchBackend.
+TITLE_SEARCH_BACKENDS = {
+    'sqlite': 'api.search.SQLiteSearchBackend',
+}
+
 # EMAIL settings
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
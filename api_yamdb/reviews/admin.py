@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import User, Title, Comment, Review, Genre, Category
+from .models import (Category, Comment, Genre, OutgoingEmail, Review, Title,
+                     User)
 
 
 @admin.register(User)
@@ -81,3 +82,17 @@ class ReviewAdmin(admin.ModelAdmin):
     search_fields = ('text',)
     list_filter = ('author',)
     empty_value_display = 'пустое значение'
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'attempts',
+        'send_after',
+        'sent_at'
+    )
+    search_fields = ('recipient',)
+    empty_value_display = 'пустое значение'
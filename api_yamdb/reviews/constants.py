@@ -2,3 +2,5 @@ USERNAME_MAX_LENGTH = 150
 EMAIL_MAX_LENGTH = 254
 NAME_MAX_LENGTH = 256
 SLUG_MAX_LENGTH = 50
+MIN_SCORE = 1
+MAX_SCORE = 10
@@ -1,137 +1,436 @@
 import csv
+import hashlib
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from itertools import islice
+from threading import Lock
 
-from django.core.management.base import BaseCommand
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from reviews.models import (Category, Comment, Genre, ImportCheckpoint,
+                            Review, Title, TitleStatistics, User)
+from reviews.signals import csv_imported
 
 ThroughModel = Title.genre.through
 
+DEFAULT_BATCH_SIZE = 1000
+UPSERT_VENDORS = ('sqlite', 'postgresql')
+FINGERPRINT_WINDOW = 64 * 1024
 
-class Command(BaseCommand):
-    help = 'load data from csv'
 
-    def handle(self, *args, **options):
+class LineReader:
+    """Построчно читает файл, запоминая смещение после последней строки.
 
-        with open(
-            'static/data/users.csv',
-            encoding="utf-8-sig"
-        ) as csv_file:
+    csv.reader забирает строки только по мере надобности, поэтому после
+    каждой записи `position` указывает на ее конец.
+    """
 
-            csv_reader = csv.DictReader(csv_file, delimiter=',',)
-            for row in csv_reader:
-                id = row['id']
-                username = row['username']
-                email = row['email']
-                role = row['role']
-                bio = row['bio']
-                first_name = row['first_name']
-                last_name = row['last_name']
-                user = User(
-                    id=id, username=username, email=email, role=role, bio=bio,
-                    first_name=first_name, last_name=last_name
-                )
-                user.save()
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+        self.position = csv_file.tell()
 
-        with open(
-            'static/data/category.csv',
-            encoding="utf-8-sig"
-        ) as csv_file:
+    def __iter__(self):
+        return self
 
-            csv_reader = csv.DictReader(csv_file, delimiter=',')
-            for row in csv_reader:
-                id = row['id']
-                name = row['name']
-                slug = row['slug']
-                category = Category(id=id, name=name, slug=slug)
-                category.save()
+    def __next__(self):
+        line = self.csv_file.readline()
+        if not line:
+            raise StopIteration
+        self.position += len(line)
+        return line.decode('utf-8')
+
+
+class CsvTable:
+    """CSV-файл и модель, в которую загружаются его строки.
+
+    `columns` сопоставляет колонки файла с атрибутами модели; внешние
+    ключи задаются через `<поле>_id`, поэтому связанные объекты не
+    запрашиваются из базы.
+    """
+
+    def __init__(self, filename, model, columns, **reader_options):
+        self.filename = filename
+        self.model = model
+        self.columns = columns
+        self.reader_options = reader_options
+        self.fields = {
+            column: model._meta.get_field(attname)
+            for column, attname in columns.items()
+        }
+        self.update_fields = [
+            field for field in self.fields.values()
+            if not field.primary_key and not getattr(
+                field, 'auto_now_add', False
+            )
+        ]
 
-        with open(
-            'static/data/titles.csv',
-            encoding="utf-8-sig"
-        ) as csv_file:
+    def convert(self, field, value):
+        if value == '' and field.null:
+            return None
+        return field.to_python(value)
 
+    def read(self, path, offset=0):
+        """Возвращает пары (объект, смещение конца строки в файле)."""
+        with open(path, 'rb') as csv_file:
+            header = next(csv.reader(
+                [csv_file.readline().decode('utf-8-sig')],
+                delimiter=',', **self.reader_options
+            ))
+            if offset > csv_file.tell():
+                csv_file.seek(offset)
+            lines = LineReader(csv_file)
             csv_reader = csv.DictReader(
-                csv_file,
-                delimiter=',',
-                doublequote=False)
+                lines, fieldnames=header, delimiter=',', **self.reader_options
+            )
             for row in csv_reader:
-                id = row['id']
-                name = row['name']
-                year = row['year']
-                category_id = row['category']
-                title = Title(id=id,
-                              name=name,
-                              year=year,
-                              category=Category.objects.get(id=category_id))
-                title.save()
-
-        with open(
-            'static/data/genre.csv',
-            encoding="utf-8-sig"
-        ) as csv_file:
-
-            csv_reader = csv.DictReader(csv_file, delimiter=',')
-            for row in csv_reader:
-                id = row['id']
-                name = row['name']
-                slug = row['slug']
-                genre = Genre(id=id, name=name, slug=slug)
-                genre.save()
-
-        with open(
-            'static/data/review.csv',
-            encoding="utf-8-sig"
-        ) as csv_file:
-
-            csv_reader = csv.DictReader(csv_file, delimiter=',',)
-            for row in csv_reader:
-                id = row['id']
-                title_id = row['title_id']
-                text = row['text']
-                author_id = row['author']
-                author = User.objects.get(pk=author_id)
-                score = row['score']
-                pub_date = row['pub_date']
-                review = Review(
-                    id=id, title_id=title_id, text=text, author=author,
-                    score=score, pub_date=pub_date
-                )
-                review.save()
+                yield self.model(**{
+                    field.attname: self.convert(field, row[column])
+                    for column, field in self.fields.items()
+                }), lines.position
 
-        with open(
-            'static/data/genre_title.csv',
-            encoding="utf-8-sig"
-        ) as csv_file:
 
-            csv_reader = csv.DictReader(csv_file, delimiter=',',)
-            for row in csv_reader:
-                id = row['id']
-                title_id = row['title_id']
-                genre_id = row['genre_id']
-                title_genre = ThroughModel(
-                    id=id,
-                    title=Title.objects.get(id=title_id),
-                    genre=Genre.objects.get(id=genre_id)
-                )
-                title_genre.save()
+TABLES = (
+    CsvTable('users.csv', User, {
+        'id': 'id',
+        'username': 'username',
+        'email': 'email',
+        'role': 'role',
+        'bio': 'bio',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }),
+    CsvTable('category.csv', Category, {
+        'id': 'id',
+        'name': 'name',
+        'slug': 'slug',
+    }),
+    CsvTable('titles.csv', Title, {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'category': 'category_id',
+    }, doublequote=False),
+    CsvTable('genre.csv', Genre, {
+        'id': 'id',
+        'name': 'name',
+        'slug': 'slug',
+    }),
+    CsvTable('review.csv', Review, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'text': 'text',
+        'author': 'author_id',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }),
+    CsvTable('genre_title.csv', ThroughModel, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'genre_id': 'genre_id',
+    }),
+    CsvTable('comments.csv', Comment, {
+        'id': 'id',
+        'review_id': 'review_id',
+        'text': 'text',
+        'author': 'author_id',
+        'pub_date': 'pub_date',
+    }),
+)
 
-        with open(
-            'static/data/comments.csv',
-            encoding="utf-8-sig"
-        ) as csv_file:
 
-            csv_reader = csv.DictReader(csv_file, delimiter=',',)
-            for row in csv_reader:
-                id = row['id']
-                review_id = row['review_id']
-                text = row['text']
-                author_id = row['author']
-                author = User.objects.get(pk=author_id)
-                pub_date = row['pub_date']
-                comment = Comment(
-                    id=id,
-                    review_id=review_id,
-                    text=text,
-                    author=author,
-                    pub_date=pub_date
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def read_ahead(batches):
+    """Разбирает следующую пачку в отдельном потоке, пока пишется текущая."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, batches, None)
+        while True:
+            batch = future.result()
+            if batch is None:
+                return
+            future = executor.submit(next, batches, None)
+            yield batch
+
+
+def fingerprint(path, offset):
+    """Хеш начала файла и участка перед `offset`.
+
+    Совпадение означает, что загруженная часть не переписана и файл
+    только дополнялся, при этом весь файл заново не читается.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as csv_file:
+        digest.update(csv_file.read(min(offset, FINGERPRINT_WINDOW)))
+        start = max(offset - FINGERPRINT_WINDOW, 0)
+        csv_file.seek(start)
+        digest.update(csv_file.read(offset - start))
+    return digest.hexdigest()
+
+
+def dependencies(tables):
+    """Для каждого файла возвращает файлы, на строки которых он ссылается."""
+    by_model = {table.model: table for table in tables}
+    return {
+        table: {
+            by_model[field.related_model]
+            for field in table.model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in by_model
+            and field.related_model is not table.model
+        }
+        for table in tables
+    }
+
+
+class Command(BaseCommand):
+    help = 'load data from csv'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=settings.BASE_DIR / 'static' / 'data',
+            help='directory with csv files',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='rows per bulk insert',
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='insert new rows and update changed rows by id',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'files loaded concurrently once the files they reference '
+                'are loaded'
+            ),
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='load only rows appended since the previous run',
+        )
+
+    def handle(self, *args, **options):
+        if options['upsert'] and connection.vendor not in UPSERT_VENDORS:
+            raise CommandError(
+                f'--upsert is not supported for {connection.vendor}'
+            )
+        write = self.upsert if options['upsert'] else self.insert
+        # SQLite допускает одного пишущего: файлы загружаются по очереди,
+        # параллельно идет только разбор следующей пачки.
+        self.write_lock = (
+            Lock() if connection.vendor == 'sqlite' else nullcontext()
+        )
+        # Загруженное сверх create/save: для пересчета рейтинга и
+        # статистики произведений и сброса кеша API.
+        self.touched_models = set()
+        self.touched_titles = set()
+        self.touched_reviews = set()
+        self.touched_lock = Lock()
+        pending = dependencies(TABLES)
+        loaded = set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while pending or running:
+                for table, required in list(pending.items()):
+                    if required <= loaded:
+                        del pending[table]
+                        future = executor.submit(
+                            self.load_in_thread, table, write, options
+                        )
+                        running[future] = table
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table = running.pop(future)
+                    self.stdout.write(f'{table.filename}: {future.result()}')
+                    loaded.add(table)
+        # bulk_create обходит Review.save(), поэтому рейтинг и статистика
+        # пересчитываются после загрузки для затронутых произведений.
+        with transaction.atomic():
+            for ids in chunked(sorted(self.touched_titles),
+                               options['batch_size']):
+                titles = Title.objects.filter(pk__in=ids)
+                titles.recalculate_rating()
+                TitleStatistics.objects.rebuild(titles)
+        csv_imported.send(
+            sender=self.__class__,
+            models=self.touched_models,
+            titles=self.touched_titles,
+            reviews=self.touched_reviews,
+        )
+
+    def load_in_thread(self, table, write, options):
+        try:
+            with self.write_lock:
+                return self.load(table, write, options)
+        finally:
+            connection.close()
+
+    def load(self, table, write, options):
+        """Загружает файл в одной транзакции и сохраняет отметку загрузки.
+
+        В режиме --incremental чтение начинается с сохраненного смещения,
+        если загруженная часть файла не изменилась, а строки с id не
+        больше загруженного ранее пропускаются.
+        """
+        path = f'{options["path"]}/{table.filename}'
+        offset, loaded_id = 0, None
+        checkpoint = ImportCheckpoint.objects.filter(
+            filename=table.filename
+        ).first()
+        if options['incremental'] and checkpoint is not None:
+            loaded_id = checkpoint.last_id
+            if checkpoint.fingerprint == fingerprint(path, checkpoint.offset):
+                offset = checkpoint.offset
+        last_id = loaded_id
+        # Пустая пачка дает нулевые счетчики для отчета.
+        counts = Counter(write(table, []))
+        position = offset
+        with transaction.atomic():
+            rows = table.read(path, offset)
+            for batch in read_ahead(chunked(rows, options['batch_size'])):
+                position = batch[-1][1]
+                objs = [
+                    obj for obj, _ in batch
+                    if loaded_id is None or obj.pk > loaded_id
+                ]
+                self.touch(table, objs)
+                counts.update(write(table, objs))
+                last_id = max([last_id or 0] + [obj.pk for obj in objs])
+            ImportCheckpoint.objects.update_or_create(
+                filename=table.filename,
+                defaults={
+                    'offset': position,
+                    'fingerprint': fingerprint(path, position),
+                    'last_id': last_id,
+                }
+            )
+        return ', '.join(f'{count} {name}' for name, count in counts.items())
+
+    def touch(self, table, objs):
+        """Запоминает произведения и отзывы, которых касаются строки пачки.
+
+        Вызывается до записи, чтобы учесть и прежние произведение или
+        отзыв строк, перезаписываемых в режиме --upsert.
+        """
+        model = table.model
+        pks = [obj.pk for obj in objs]
+        titles, reviews = set(), set()
+        if model is Title:
+            titles.update(pks)
+        elif model in (Review, ThroughModel):
+            titles.update(obj.title_id for obj in objs)
+            titles.update(model.objects.filter(pk__in=pks).values_list(
+                'title_id', flat=True
+            ))
+        elif model is Comment:
+            reviews.update(obj.review_id for obj in objs)
+            reviews.update(Comment.objects.filter(pk__in=pks).values_list(
+                'review_id', flat=True
+            ))
+            titles.update(Review.objects.filter(pk__in=reviews).values_list(
+                'title_id', flat=True
+            ))
+        with self.touched_lock:
+            if objs:
+                self.touched_models.add(model)
+            self.touched_titles.update(titles)
+            self.touched_reviews.update(reviews)
+
+    def insert(self, table, objs):
+        table.model.objects.bulk_create(objs)
+        return {'rows loaded': len(objs)}
+
+    def upsert(self, table, batch):
+        """Записывает пачку через INSERT ... ON CONFLICT (id) DO UPDATE.
+
+        Строки сравниваются с уже сохраненными по колонкам файла, в
+        запрос попадают только новые и измененные.
+        """
+        model = table.model
+        batch = list({obj.pk: obj for obj in batch}.values())
+        attnames = [field.attname for field in table.update_fields]
+        stored = {
+            row[0]: row[1:]
+            for row in model.objects.filter(
+                pk__in=[obj.pk for obj in batch]
+            ).values_list('pk', *attnames)
+        }
+        new, changed = [], []
+        for obj in batch:
+            if obj.pk not in stored:
+                new.append(obj)
+            elif stored[obj.pk] != tuple(
+                getattr(obj, attname) for attname in attnames
+            ):
+                changed.append(obj)
+        objs = new + changed
+        fields = model._meta.concrete_fields
+        size = connection.ops.bulk_batch_size(fields, objs) or len(objs)
+        with connection.cursor() as cursor:
+            for part in chunked(objs, size):
+                sql, params = self.upsert_sql(table, fields, part)
+                cursor.execute(sql, params)
+        return {
+            'inserted': len(new),
+            'updated': len(changed),
+            'unchanged': len(batch) - len(objs),
+        }
+
+    def upsert_sql(self, table, fields, objs):
+        quote = connection.ops.quote_name
+        model = table.model
+        row = '({})'.format(', '.join(['%s'] * len(fields)))
+        if table.update_fields:
+            assignments = [
+                f'{quote(field.column)} = EXCLUDED.{quote(field.column)}'
+                for field in table.update_fields
+            ]
+            auth_columns = [
+                quote(field.column) for field in table.update_fields
+                if field.name in getattr(model, 'AUTH_FIELDS', ())
+            ]
+            if auth_columns:
+                # Как User.save(): изменение прав отзывает выданные токены.
+                version = quote(model._meta.get_field('auth_version').column)
+                changed = ' OR '.join(
+                    f'{quote(model._meta.db_table)}.{column} '
+                    f'<> EXCLUDED.{column}'
+                    for column in auth_columns
+                )
+                assignments.append(
+                    f'{version} = {version} + '
+                    f'CASE WHEN {changed} THEN 1 ELSE 0 END'
                 )
-                comment.save()
+            action = 'DO UPDATE SET ' + ', '.join(assignments)
+        else:
+            action = 'DO NOTHING'
+        sql = (
+            f'INSERT INTO {quote(model._meta.db_table)} '
+            f'({", ".join(quote(field.column) for field in fields)}) '
+            f'VALUES {", ".join([row] * len(objs))} '
+            f'ON CONFLICT ({quote(model._meta.pk.column)}) {action}'
+        )
+        params = [
+            field.get_db_prep_save(field.pre_save(obj, True), connection)
+            for obj in objs
+            for field in fields
+        ]
+        return sql, params
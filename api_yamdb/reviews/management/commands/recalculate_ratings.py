@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title, TitleStatistics
+
+
+class Command(BaseCommand):
+    help = 'recalculate stored title ratings and statistics from reviews'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.objects.recalculate_rating()
+            TitleStatistics.objects.rebuild()
+        self.stdout.write(
+            f'Recalculated ratings and statistics for {updated} titles'
+        )
@@ -0,0 +1,120 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_DELAY = 30
+MAX_RETRY_DELAY = 60 * 60
+LEASE = timedelta(minutes=5)
+
+
+class Command(BaseCommand):
+    help = 'send queued emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='emails sent over one mail server connection',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=DEFAULT_MAX_ATTEMPTS,
+            help='attempts before an email is left unsent',
+        )
+        parser.add_argument(
+            '--retry-delay',
+            type=int,
+            default=DEFAULT_RETRY_DELAY,
+            help='seconds before the first retry, doubled on each attempt',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='keep polling the queue',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='seconds between polls of an empty queue with --loop',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = self.send_batch(options)
+            if not options['loop']:
+                return
+            if not sent:
+                time.sleep(options['interval'])
+
+    def claim(self, options):
+        """Забирает пачку писем и откладывает их на время отправки.
+
+        Пока срок не истек, другой обработчик очереди их не возьмет.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                OutgoingEmail.objects.select_for_update(
+                    skip_locked=True
+                ).filter(
+                    sent_at__isnull=True,
+                    send_after__lte=now,
+                    attempts__lt=options['max_attempts'],
+                )[:options['batch_size']]
+            )
+            OutgoingEmail.objects.filter(
+                pk__in=[email.pk for email in emails]
+            ).update(send_after=now + LEASE)
+        return emails
+
+    def send_batch(self, options):
+        emails = self.claim(options)
+        if not emails:
+            return 0
+        sent = 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for email in emails:
+                self.fail(email, error, options['retry_delay'])
+        else:
+            with connection:
+                for email in emails:
+                    message = EmailMessage(
+                        subject=email.subject,
+                        body=email.message,
+                        from_email=email.from_email,
+                        to=[email.recipient],
+                        connection=connection,
+                    )
+                    try:
+                        message.send()
+                    except Exception as error:
+                        self.fail(email, error, options['retry_delay'])
+                    else:
+                        email.attempts += 1
+                        email.sent_at = timezone.now()
+                        sent += 1
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'send_after', 'last_error', 'sent_at')
+        )
+        self.stdout.write(f'{sent} of {len(emails)} emails sent')
+        return sent
+
+    def fail(self, email, error, retry_delay):
+        email.attempts += 1
+        email.last_error = str(error)
+        delay = min(retry_delay * 2 ** (email.attempts - 1), MAX_RETRY_DELAY)
+        email.send_after = timezone.now() + timedelta(seconds=delay)
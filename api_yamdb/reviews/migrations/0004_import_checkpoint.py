@@ -0,0 +1,28 @@
+# Generated by Django 3.2 on 2026-10-18 19:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(max_length=256, unique=True, verbose_name='Файл')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Смещение в байтах')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='Хеш загруженной части')),
+                ('last_id', models.PositiveBigIntegerField(null=True, verbose_name='Последний id')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата загрузки')),
+            ],
+            options={
+                'verbose_name': 'Отметка загрузки',
+                'verbose_name_plural': 'Отметки загрузки',
+            },
+        ),
+    ]
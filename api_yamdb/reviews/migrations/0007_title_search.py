@@ -0,0 +1,92 @@
+from django.db import OperationalError, migrations, transaction
+
+# Полнотекстовый индекс произведений для SQLite: внешняя FTS5-таблица над
+# reviews_title с триграммным токенизатором (поиск по подстроке и префиксу),
+# синхронизируется триггерами при любой записи, в том числе bulk_create.
+# Если SQLite собран без FTS5 или старше 3.34 (нет токенизатора trigram),
+# индекс не создается и поиск работает без него (api/search.py).
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE reviews_title_fts USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_insert AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_delete AFTER DELETE ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts (reviews_title_fts, rowid, name,
+                                       description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_update
+    AFTER UPDATE OF id, name, description ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts (reviews_title_fts, rowid, name,
+                                       description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO reviews_title_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO reviews_title_fts (reviews_title_fts) VALUES ('rebuild')",
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def fts5_trigram_supported(schema_editor):
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute(
+                'CREATE VIRTUAL TABLE temp.reviews_title_fts_probe '
+                "USING fts5(name, tokenize='trigram')"
+            )
+            schema_editor.execute('DROP TABLE temp.reviews_title_fts_probe')
+    except OperationalError:
+        return False
+    return True
+
+
+def create_index(apps, schema_editor):
+    if (schema_editor.connection.vendor != 'sqlite'
+            or not fts5_trigram_supported(schema_editor)):
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_user_auth_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_index, run_on_sqlite(DROP_SQL)
+        ),
+    ]
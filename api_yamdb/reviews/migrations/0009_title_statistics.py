@@ -0,0 +1,57 @@
+# Generated by Django 3.2 on 2026-10-18 19:33
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_statistics(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    TitleStatistics = apps.get_model('reviews', 'TitleStatistics')
+    statistics = {
+        pk: TitleStatistics(title_id=pk)
+        for pk in Title.objects.values_list('pk', flat=True)
+    }
+    for title_id, score, count in Review.objects.order_by().values_list(
+        'title', 'score'
+    ).annotate(count=Count('pk')):
+        setattr(statistics[title_id], f'score_{score}', count)
+    for title_id, count in Comment.objects.order_by().values_list(
+        'review__title'
+    ).annotate(count=Count('pk')):
+        statistics[title_id].comment_count = count
+    TitleStatistics.objects.bulk_create(statistics.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStatistics',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='10')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Количество комментариев')),
+            ],
+            options={
+                'verbose_name': 'Статистика произведения',
+                'verbose_name_plural': 'Статистика произведений',
+            },
+        ),
+        migrations.RunPython(fill_statistics, migrations.RunPython.noop),
+    ]
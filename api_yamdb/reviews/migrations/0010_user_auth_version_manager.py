@@ -0,0 +1,20 @@
+# Generated by Django 3.2 on 2026-10-18 20:31
+
+from django.db import migrations
+import reviews.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_title_statistics'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', reviews.models.AuthVersionUserManager()),
+            ],
+        ),
+    ]
@@ -1,12 +1,40 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-
-from .constants import (EMAIL_MAX_LENGTH, NAME_MAX_LENGTH, SLUG_MAX_LENGTH,
-                        USERNAME_MAX_LENGTH)
+from django.db import models, transaction
+from django.db.models import (Case, Count, F, OuterRef, Q, Subquery, Sum,
+                              When)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .constants import (EMAIL_MAX_LENGTH, MAX_SCORE, MIN_SCORE,
+                        NAME_MAX_LENGTH, SLUG_MAX_LENGTH, USERNAME_MAX_LENGTH)
 from .validators import validate_username, validate_year
 
 
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        """Увеличивает auth_version у строк, где меняются права доступа.
+
+        Закешированная версия (api/authentication.py) обновится не позже
+        чем через AUTH_VERSION_CACHE_TIMEOUT.
+        """
+        changed = Q()
+        for field in User.AUTH_FIELDS:
+            if field in kwargs:
+                changed |= ~Q(**{field: kwargs[field]})
+        if changed and 'auth_version' not in kwargs:
+            kwargs['auth_version'] = Case(
+                When(changed, then=F('auth_version') + 1),
+                default=F('auth_version'),
+            )
+        return super().update(**kwargs)
+
+
+class AuthVersionUserManager(UserManager.from_queryset(UserQuerySet)):
+    """UserManager, у которого update() учитывает auth_version."""
+
+
 class User(AbstractUser):
 
     USER = 'user'
@@ -38,6 +66,17 @@ class User(AbstractUser):
         choices=USER_ROLES,
         default=USER,
     )
+    auth_version = models.PositiveIntegerField(
+        'Версия прав доступа',
+        default=0,
+        editable=False,
+    )
+
+    # Поля, от которых зависят права доступа. Их изменение увеличивает
+    # auth_version и отзывает выданные ранее токены.
+    AUTH_FIELDS = ('role', 'is_staff', 'is_superuser', 'is_active')
+
+    objects = AuthVersionUserManager()
 
     class Meta:
         ordering = ('username',)
@@ -59,6 +98,34 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if set(cls.AUTH_FIELDS) <= set(field_names):
+            instance._stored_auth = instance.get_auth_state()
+        if 'username' in field_names:
+            instance._stored_username = instance.username
+        return instance
+
+    def get_auth_state(self):
+        return tuple(getattr(self, field) for field in self.AUTH_FIELDS)
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            stored = getattr(self, '_stored_auth', None)
+            if stored is None:
+                stored = User.objects.filter(pk=self.pk).values_list(
+                    *self.AUTH_FIELDS
+                ).first()
+            if stored is not None and stored != self.get_auth_state():
+                self.auth_version += 1
+                update_fields = kwargs.get('update_fields')
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'auth_version'}
+        super().save(*args, **kwargs)
+        self._stored_auth = self.get_auth_state()
+        self._stored_username = self.username
+
 
 class CategoryGenreBase(models.Model):
     """Базовый класс для категорий и жанров."""
@@ -95,6 +162,33 @@ class Genre(CategoryGenreBase):
         verbose_name_plural = 'Жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+    """Запросы к произведениям с поддержкой хранимого рейтинга."""
+
+    def shift_rating(self, title_id, score, count):
+        """Добавляет оценку к сумме и количеству оценок произведения."""
+        return self.filter(pk=title_id).update(
+            rating_sum=F('rating_sum') + score,
+            rating_count=F('rating_count') + count,
+        )
+
+    def recalculate_rating(self):
+        """Пересчитывает хранимый рейтинг по всем отзывам."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            ),
+        )
+
+
 class Title(models.Model):
     """Описание модели произведений."""
 
@@ -124,14 +218,40 @@ class Title(models.Model):
         verbose_name='Категория',
 
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+            models.Index(
+                fields=('category', 'year', 'name'),
+                name='title_category_year_name_idx'
+            ),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class ReviewCommentBase(models.Model):
     """Базовый класс для отзывов и комментариев."""
@@ -179,10 +299,35 @@ class Review(ReviewCommentBase):
                 fields=["author", "title"], name="unique_review"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.author} - {self.title}'
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            stored = None
+            if not self._state.adding:
+                # Блокировка строки: параллельные изменения оценки одного
+                # отзыва считают разницу от уже сохраненного значения.
+                stored = Review.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('title_id', 'score').first()
+            super().save(*args, **kwargs)
+            current = (self.title_id, self.score)
+            if stored != current:
+                if stored is not None:
+                    Title.objects.shift_rating(stored[0], -stored[1], -1)
+                Title.objects.shift_rating(self.title_id, self.score, 1)
+                TitleStatistics.objects.move_review(
+                    self, stored, current
+                )
+
 
 class Comment(ReviewCommentBase):
     """Описание модели комментариев."""
@@ -197,6 +342,232 @@ class Comment(ReviewCommentBase):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.author} - {self.review}'
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                TitleStatistics.objects.shift(
+                    self.review.title_id, comments=1
+                )
+
+
+class TitleStatisticsQuerySet(models.QuerySet):
+    """Запросы к хранимой статистике произведений."""
+
+    def shift(self, title_id, scores=None, comments=0, create=True):
+        """Изменяет счетчики оценок и комментариев произведения.
+
+        `scores` сопоставляет оценке изменение числа отзывов с ней.
+        Статистика создается вместе с произведением (reviews/signals.py).
+        Если ее нет (произведение записано в обход save()), она строится
+        по уже сохраненным отзывам, поэтому вызывать метод нужно после
+        записи. При удалении (`create=False`) отсутствующая статистика не
+        создается: вместе с отзывами может удаляться и само произведение.
+        """
+        changes = {
+            f'score_{score}': F(f'score_{score}') + delta
+            for score, delta in (scores or {}).items() if delta
+        }
+        if comments:
+            changes['comment_count'] = F('comment_count') + comments
+        if not changes:
+            return
+        if self.filter(title_id=title_id).update(**changes) or not create:
+            return
+        calculated = self.calculate(Title.objects.filter(pk=title_id))
+        _, created = self.get_or_create(
+            title_id=title_id,
+            defaults={
+                field.attname: getattr(calculated[title_id], field.attname)
+                for field in self.model._meta.concrete_fields
+                if not field.primary_key
+            }
+        )
+        if not created:
+            # Строку успела создать параллельная транзакция, ее подсчет
+            # еще не включает эту запись.
+            self.filter(title_id=title_id).update(**changes)
+
+    def move_review(self, review, stored, current):
+        """Учитывает изменение пары (произведение, оценка) отзыва."""
+        if stored is not None and stored[0] == current[0]:
+            self.shift(current[0], {stored[1]: -1, current[1]: 1})
+            return
+        comments = 0
+        if stored is not None:
+            comments = review.comments.count()
+            self.shift(stored[0], {stored[1]: -1}, -comments)
+        self.shift(current[0], {current[1]: 1}, comments)
+
+    def calculate(self, titles):
+        """Статистика произведений по отзывам, без записи в базу."""
+        statistics = {
+            pk: TitleStatistics(title_id=pk)
+            for pk in titles.values_list('pk', flat=True)
+        }
+        reviews = Review.objects.filter(title__in=titles).order_by()
+        for title_id, score, count in reviews.values_list(
+            'title', 'score'
+        ).annotate(count=Count('pk')):
+            setattr(statistics[title_id], f'score_{score}', count)
+        comments = Comment.objects.filter(
+            review__title__in=titles
+        ).order_by()
+        for title_id, count in comments.values_list(
+            'review__title'
+        ).annotate(count=Count('pk')):
+            statistics[title_id].comment_count = count
+        return statistics
+
+    def rebuild(self, titles=None):
+        """Пересчитывает статистику произведений по отзывам."""
+        if titles is None:
+            titles = Title.objects.all()
+        statistics = self.calculate(titles)
+        self.filter(title__in=titles).delete()
+        self.bulk_create(statistics.values(), batch_size=1000)
+        return len(statistics)
+
+
+class TitleStatistics(models.Model):
+    """Распределение оценок и число комментариев к произведению."""
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='statistics',
+        verbose_name='Произведение'
+    )
+    score_1 = models.PositiveIntegerField(default=0, verbose_name='1')
+    score_2 = models.PositiveIntegerField(default=0, verbose_name='2')
+    score_3 = models.PositiveIntegerField(default=0, verbose_name='3')
+    score_4 = models.PositiveIntegerField(default=0, verbose_name='4')
+    score_5 = models.PositiveIntegerField(default=0, verbose_name='5')
+    score_6 = models.PositiveIntegerField(default=0, verbose_name='6')
+    score_7 = models.PositiveIntegerField(default=0, verbose_name='7')
+    score_8 = models.PositiveIntegerField(default=0, verbose_name='8')
+    score_9 = models.PositiveIntegerField(default=0, verbose_name='9')
+    score_10 = models.PositiveIntegerField(default=0, verbose_name='10')
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество комментариев'
+    )
+
+    objects = TitleStatisticsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.review_count}'
+
+    @property
+    def histogram(self):
+        """Число отзывов с каждой оценкой."""
+        return {
+            score: getattr(self, f'score_{score}')
+            for score in range(MIN_SCORE, MAX_SCORE + 1)
+        }
+
+    @property
+    def review_count(self):
+        return sum(self.histogram.values())
+
+
+class ImportCheckpoint(models.Model):
+    """Позиция, до которой CSV-файл загружен командой import_csv."""
+
+    filename = models.CharField(
+        max_length=NAME_MAX_LENGTH,
+        unique=True,
+        verbose_name='Файл'
+    )
+    offset = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Смещение в байтах'
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        verbose_name='Хеш загруженной части'
+    )
+    last_id = models.PositiveBigIntegerField(
+        null=True,
+        verbose_name='Последний id'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата загрузки'
+    )
+
+    class Meta:
+        verbose_name = 'Отметка загрузки'
+        verbose_name_plural = 'Отметки загрузки'
+
+    def __str__(self):
+        return f'{self.filename}: {self.offset}'
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку командой send_emails."""
+
+    subject = models.CharField(
+        max_length=NAME_MAX_LENGTH,
+        verbose_name='Тема'
+    )
+    message = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        max_length=EMAIL_MAX_LENGTH,
+        verbose_name='Отправитель'
+    )
+    recipient = models.EmailField(
+        max_length=EMAIL_MAX_LENGTH,
+        verbose_name='Получатель'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить после'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки'
+    )
+
+    class Meta:
+        ordering = ('send_after', 'id')
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=('sent_at', 'send_after'),
+                name='outgoing_email_queue_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
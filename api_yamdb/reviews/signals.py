@@ -0,0 +1,86 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Subquery
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import Comment, Review, Title, TitleStatistics
+
+PRAGMA_RE = re.compile(r'^-?\w+$')
+
+# Отправляется import_csv после загрузки, которая обходит сигналы моделей.
+# Аргументы: models — модели загруженных строк, titles и reviews — id
+# затронутых произведений и отзывов (комментарии которых загружены).
+csv_imported = Signal()
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Выполняет PRAGMA из настройки SQLITE_PRAGMAS на новом подключении."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            if not (PRAGMA_RE.match(name) and PRAGMA_RE.match(str(value))):
+                raise ImproperlyConfigured(
+                    f'Недопустимая настройка SQLITE_PRAGMAS: {name}={value}'
+                )
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def close_unusable_connections(sender, **kwargs):
+    """Закрывает постоянные подключения, разорванные со стороны базы.
+
+    Выполняется после close_old_connections, поэтому проверяются только
+    подключения, которые будут переиспользованы. Подключения внутри
+    транзакции (например, в тестах) не трогаются.
+    """
+    for connection in connections.all():
+        if (connection.connection is not None
+                and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and not connection.in_atomic_block
+                and not connection.is_usable()):
+            connection.close()
+
+
+@receiver(post_save, sender=Title)
+def create_title_statistics(sender, instance, created, raw=False, **kwargs):
+    """Заводит пустую статистику нового произведения.
+
+    Иначе первые параллельные отзывы создавали бы ее одновременно.
+    """
+    if created and not raw:
+        TitleStatistics.objects.create(title=instance)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    """Вычитает оценку удаленного отзыва из рейтинга произведения.
+
+    Срабатывает и при каскадном удалении, внутри той же транзакции.
+    """
+    Title.objects.shift_rating(instance.title_id, -instance.score, -1)
+    TitleStatistics.objects.shift(
+        instance.title_id, {instance.score: -1}, create=False
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment(sender, instance, **kwargs):
+    """Вычитает удаленный комментарий из статистики произведения.
+
+    При каскадном удалении отзыва комментарии удаляются раньше него.
+    """
+    TitleStatistics.objects.shift(
+        Subquery(
+            Review.objects.filter(pk=instance.review_id).values('title_id')
+        ),
+        comments=-1,
+        create=False
+    )
@@ -0,0 +1,191 @@
+"""Нагрузочный тест синхронных и асинхронных GET-представлений под uvicorn.
+
+Запускает uvicorn с api_yamdb.asgi на заполненной базе и для каждого
+пути (/api/v1/... и /api/v1/async/...) держит `--clients` одновременных
+клиентов. Клиенты медленные: каждый ждет `--think` секунд между
+запросами, а каждый ответ читает с задержкой `--read-delay`. Выводятся
+запросы в секунду и перцентили задержки. С `--no-cache` к каждому
+запросу добавляется уникальный параметр, чтобы он не брался из кеша
+ответов и доходил до базы.
+
+    pip install uvicorn
+    python benchmarks/async_load.py --clients 200 --seconds 20
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from utils import BASE_DIR, django_database
+
+PATHS = (
+    '/api/v1/titles/?page={page}',
+    '/api/v1/titles/1/reviews/?page={page}',
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--think', type=float, default=0.05)
+    parser.add_argument('--read-delay', type=float, default=0.05)
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--database')
+    return parser.parse_args()
+
+
+def seed(titles):
+    from reviews.models import Category, Review, Title, TitleStatistics, User
+
+    category = Category.objects.create(name='Фильмы', slug='movies')
+    # SQLite не возвращает id из bulk_create, поэтому они задаются явно.
+    Title.objects.bulk_create(
+        Title(id=idx + 1, name=f'Произведение {idx}', year=2000,
+              category=category)
+        for idx in range(titles)
+    )
+    users = User.objects.bulk_create(
+        User(id=idx + 1, username=f'user{idx}', email=f'u{idx}@yamdb.fake')
+        for idx in range(titles)
+    )
+    Review.objects.bulk_create(
+        Review(title_id=1, author=user, text='Отзыв', score=7)
+        for user in users
+    )
+    Title.objects.recalculate_rating()
+    TitleStatistics.objects.rebuild()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def fetch(port, path, read_delay):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+            'Connection: close\r\n\r\n'.encode()
+        )
+        await writer.drain()
+        status = (await reader.readline()).split()[1]
+        # Медленный клиент: ответ дочитывается не сразу.
+        await asyncio.sleep(read_delay)
+        await reader.read()
+        return int(status)
+    finally:
+        writer.close()
+
+
+async def client(port, path, deadline, args, latencies, errors):
+    page = 1
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        url = path.format(page=page % 10 + 1)
+        if args.no_cache:
+            url = f'{url}&nocache={page}-{started}'
+        try:
+            status = await fetch(port, url, args.read_delay)
+        except OSError:
+            status = None
+        if status == 200:
+            latencies.append(time.monotonic() - started)
+        else:
+            errors.append(status)
+        page += 1
+        await asyncio.sleep(args.think)
+
+
+async def load(port, path, args):
+    latencies, errors = [], []
+    deadline = time.monotonic() + args.seconds
+    await asyncio.gather(*(
+        client(port, path, deadline, args, latencies, errors)
+        for _ in range(args.clients)
+    ))
+    return latencies, errors
+
+
+def wait_for_server(port, process):
+    for _ in range(100):
+        if process.poll() is not None:
+            sys.exit('uvicorn завершился, проверьте, что он установлен')
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    sys.exit('uvicorn не запустился')
+
+
+def report(path, latencies, errors, seconds):
+    if not latencies:
+        print(f'{path:>45}: нет успешных ответов, ошибок {len(errors)}')
+        return
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f'{path:>45}: {len(latencies) / seconds:7.1f} запросов/с, '
+        f'медиана {statistics.median(latencies) * 1000:6.1f} мс, '
+        f'p95 {p95 * 1000:6.1f} мс, ошибок {len(errors)}'
+    )
+
+
+def main():
+    args = parse_args()
+    with django_database(args.database) as database:
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+        seed(args.titles)
+        port = free_port()
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='api_yamdb.settings')
+        env['YAMDB_BENCHMARK_DATABASE'] = database
+        server = subprocess.Popen(
+            [sys.executable, '-c', SERVER, str(port)],
+            cwd=BASE_DIR, env=env,
+        )
+        try:
+            wait_for_server(port, server)
+            print(
+                f'{args.clients} клиентов, {args.seconds:.0f} с на путь, '
+                f'пауза {args.think * 1000:.0f} мс, чтение ответа '
+                f'{args.read_delay * 1000:.0f} мс\n'
+            )
+            for template in PATHS:
+                for path in (
+                    template, template.replace('/v1/', '/v1/async/')
+                ):
+                    latencies, errors = asyncio.run(load(port, path, args))
+                    report(path.split('?')[0], latencies, errors,
+                           args.seconds)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+SERVER = '''
+import os
+import sys
+
+import uvicorn
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = os.environ['YAMDB_BENCHMARK_DATABASE']
+
+from api_yamdb.asgi import application
+
+uvicorn.run(application, port=int(sys.argv[1]), log_level='warning')
+'''
+
+
+if __name__ == '__main__':
+    main()
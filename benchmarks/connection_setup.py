@@ -0,0 +1,69 @@
+"""Цена открытия подключения к базе в расчете на запрос.
+
+Цикл запроса воспроизводится сигналами request_started/request_finished,
+как в обработчике Django, с одним коротким запросом к базе между ними.
+Сравниваются CONN_MAX_AGE=0 (подключение на каждый запрос) и постоянное
+подключение с проверкой перед переиспользованием и без нее.
+
+    python benchmarks/connection_setup.py --requests 5000
+"""
+import argparse
+import time
+
+from utils import django_database
+
+MODES = (
+    ('CONN_MAX_AGE=0', 0, False),
+    ('CONN_MAX_AGE=60', 60, False),
+    ('CONN_MAX_AGE=60 + проверка', 60, True),
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--database')
+    return parser.parse_args()
+
+
+def run(requests, conn_max_age, health_checks):
+    from django.core.signals import request_finished, request_started
+    from django.db import connection
+
+    from reviews.models import Category
+
+    connection.close()
+    connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+    connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+    connects = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started.send(sender=None)
+        connects += connection.connection is None
+        Category.objects.filter(slug='movies').exists()
+        request_finished.send(sender=None)
+    elapsed = time.perf_counter() - started
+    connection.close()
+    return elapsed, connects
+
+
+def main():
+    args = parse_args()
+    with django_database(args.database):
+        from django.core.management import call_command
+
+        from reviews.models import Category
+
+        call_command('migrate', verbosity=0)
+        Category.objects.get_or_create(slug='movies', name='Фильмы')
+        print(f'{args.requests} запросов\n')
+        for name, conn_max_age, health_checks in MODES:
+            elapsed, connects = run(args.requests, conn_max_age, health_checks)
+            print(
+                f'{name:>28}: {elapsed / args.requests * 1e6:8.1f} мкс '
+                f'на запрос, подключений {connects}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Сравнение быстрых сериализаторов списков с сериализаторами DRF.
+
+Для страницы произведений, отзывов и комментариев измеряется время
+загрузки и сериализации обычным путем (объекты моделей + ModelSerializer)
+и через values() + ValuesSerializer, а также проверяется, что JSON
+совпадает побайтно.
+
+    python benchmarks/list_serializers.py --rows 1000
+"""
+import argparse
+import time
+
+from utils import django_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--database')
+    return parser.parse_args()
+
+
+def seed(rows):
+    from reviews.models import (Category, Comment, Genre, Review, Title,
+                                TitleStatistics, User)
+
+    # SQLite не возвращает id из bulk_create, поэтому они задаются явно.
+    users = User.objects.bulk_create(
+        User(id=idx + 1, username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(rows)
+    )
+    categories = Category.objects.bulk_create(
+        Category(id=idx + 1, name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(10)
+    )
+    genres = Genre.objects.bulk_create(
+        Genre(id=idx + 1, name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(10)
+    )
+    titles = Title.objects.bulk_create(
+        Title(
+            id=idx + 1, name=f'Произведение {idx}', year=1950 + idx % 70,
+            description='Описание произведения. ' * 5,
+            category=categories[idx % len(categories)],
+            rating_sum=idx % 50, rating_count=idx % 7,
+        )
+        for idx in range(rows)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title=title, genre=genres[(idx + shift) % 10])
+        for idx, title in enumerate(titles)
+        for shift in range(1 + idx % 3)
+    )
+    reviews = Review.objects.bulk_create(
+        Review(
+            id=idx + 1, title=titles[0], author=user,
+            text='Текст отзыва. ' * 10, score=1 + idx % 10,
+        )
+        for idx, user in enumerate(users)
+    )
+    Comment.objects.bulk_create(
+        Comment(review=reviews[0], author=user, text='Комментарий. ' * 5)
+        for user in users
+    )
+    TitleStatistics.objects.rebuild()
+    return titles[0], reviews[0]
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    args = parse_args()
+    with django_database(args.database):
+        from django.core.management import call_command
+        from rest_framework.renderers import JSONRenderer
+
+        from api import readonly_serializers, serializers
+        from api.views import TitleViewSet
+        from reviews.models import Comment
+
+        call_command('migrate', verbosity=0)
+        title, review = seed(args.rows)
+        cases = (
+            ('titles', TitleViewSet.queryset.all(),
+             serializers.TitleSerializer,
+             readonly_serializers.TitleValuesSerializer),
+            ('reviews', title.reviews.select_related('author'),
+             serializers.ReviewSerializer,
+             readonly_serializers.ReviewValuesSerializer),
+            ('comments',
+             Comment.objects.filter(review=review).select_related('author'),
+             serializers.CommentSerializer,
+             readonly_serializers.CommentValuesSerializer),
+        )
+        print(f'{args.rows} строк на страницу, лучшее из {args.repeat}\n')
+        for name, queryset, model_serializer, values_serializer in cases:
+            page = queryset.all()[:args.rows]
+            model_time, model_data = timed(
+                lambda: model_serializer(page.all(), many=True).data,
+                args.repeat
+            )
+            serializer = values_serializer()
+            values_time, values_data = timed(
+                lambda: serializer.to_representation(
+                    serializer.get_values(queryset)[:args.rows]
+                ),
+                args.repeat
+            )
+            identical = (
+                JSONRenderer().render(model_data)
+                == JSONRenderer().render(values_data)
+            )
+            print(
+                f'{name:>9}: ModelSerializer {model_time * 1000:8.1f} ms, '
+                f'values() {values_time * 1000:8.1f} ms, '
+                f'x{model_time / values_time:.1f}, '
+                f'JSON {"совпадает" if identical else "ОТЛИЧАЕТСЯ"}'
+            )
+
+
+if __name__ == '__main__':
+    main()
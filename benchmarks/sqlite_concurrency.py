@@ -0,0 +1,156 @@
+"""Параллельная запись отзывов и чтение списков в SQLite.
+
+Сравнивает режим по умолчанию (журнал отката) с настройками
+SQLITE_PRAGMAS (WAL и др.): потоки-писатели создают отзывы через
+Review.save(), потоки-читатели запрашивают страницы произведений и
+отзывов. Выводятся число операций в секунду и ошибки блокировки.
+Каждый писатель оставляет по отзыву на произведение; если произведения
+закончились раньше `--seconds`, замер останавливается для всех потоков.
+
+    python benchmarks/sqlite_concurrency.py --writers 4 --readers 4
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+
+from utils import django_database
+
+DEFAULT_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+
+class TitlesExhausted(Exception):
+    """Писатель оставил отзывы на все произведения."""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--database')
+    return parser.parse_args()
+
+
+def seed(titles, writers):
+    from reviews.models import Category, Title, User
+
+    category = Category.objects.create(name='Фильмы', slug='movies')
+    # SQLite не возвращает id из bulk_create, поэтому они задаются явно.
+    Title.objects.bulk_create(
+        Title(id=idx + 1, name=f'Произведение {idx}', year=2000,
+              category=category)
+        for idx in range(titles)
+    )
+    return [
+        User.objects.create(username=f'writer{idx}', email=f'w{idx}@x.fake')
+        for idx in range(writers)
+    ]
+
+
+def worker(stop, results, action):
+    from django.db import OperationalError, connection
+
+    try:
+        while not stop.is_set():
+            try:
+                action()
+            except OperationalError as error:
+                results[f'ошибки: {error}'] += 1
+            except TitlesExhausted:
+                stop.set()
+            else:
+                results[action.__name__] += 1
+    finally:
+        connection.close()
+
+
+def make_writer(user, titles):
+    from reviews.models import Review
+
+    title_ids = iter(range(1, titles + 1))
+
+    def write():
+        title_id = next(title_ids, None)
+        if title_id is None:
+            raise TitlesExhausted
+        Review.objects.create(
+            title_id=title_id, author=user, text='Отзыв', score=7
+        )
+    return write
+
+
+def read():
+    from api.views import TitleViewSet
+    from reviews.models import Review
+
+    list(TitleViewSet.queryset.all()[:10])
+    list(Review.objects.filter(title_id=1).select_related('author')[:10])
+
+
+def run(pragmas, users, args):
+    from django.conf import settings
+    from django.db import connection
+
+    from reviews.models import Review
+
+    Review.objects.all().delete()
+    settings.SQLITE_PRAGMAS = pragmas
+    connection.close()
+    results = Counter()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(stop, results, make_writer(user, args.titles))
+        )
+        for user in users
+    ] + [
+        threading.Thread(target=worker, args=(stop, results, read))
+        for _ in range(args.readers)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    stop.wait(args.seconds)
+    stop.set()
+    elapsed = time.monotonic() - started
+    for thread in threads:
+        thread.join()
+    return results, elapsed
+
+
+def main():
+    args = parse_args()
+    with django_database(args.database):
+        from django.conf import settings
+        from django.core.management import call_command
+
+        tuned = dict(settings.SQLITE_PRAGMAS)
+        call_command('migrate', verbosity=0)
+        users = seed(args.titles, args.writers)
+        print(
+            f'{args.writers} писателей, {args.readers} читателей, '
+            f'{args.seconds:g} с\n'
+        )
+        for name, pragmas in (
+            ('по умолчанию', DEFAULT_PRAGMAS), ('SQLITE_PRAGMAS', tuned),
+        ):
+            results, elapsed = run(pragmas, users, args)
+            print(f'== {name}: {pragmas}')
+            if elapsed < args.seconds:
+                print(
+                    f'    произведения закончились через {elapsed:.1f} с, '
+                    'увеличьте --titles'
+                )
+            for key, count in sorted(results.items()):
+                if key in ('write', 'read'):
+                    print(f'    {key}: {count / elapsed:.0f} в секунду')
+                else:
+                    print(f'    {key}: {count}')
+            print()
+
+
+if __name__ == '__main__':
+    main()
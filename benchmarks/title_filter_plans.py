@@ -0,0 +1,133 @@
+"""Планы и время запросов TitleFilter до и после индексов миграции 0008.
+
+База заполняется случайными произведениями (по умолчанию миллион) на
+схеме 0007, затем применяется 0008 и те же запросы выполняются снова.
+
+    python benchmarks/title_filter_plans.py --titles 1000000
+"""
+import argparse
+import random
+import time
+
+from utils import django_database
+
+CATEGORIES = 50
+GENRES = 30
+BATCH_SIZE = 10000
+
+FILTERS = (
+    {'category': 'category-7'},
+    {'year': '2001'},
+    {'category': 'category-7', 'year': '2001'},
+    {'genre': 'genre-3'},
+    {'genre': 'genre-3', 'year': '2001'},
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--database',
+        help='файл SQLite (по умолчанию временный, удаляется после запуска)',
+    )
+    return parser.parse_args()
+
+
+def seed(count):
+    from django.db import connection, transaction
+
+    rng = random.Random(0)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO reviews_category (id, name, slug) '
+            'VALUES (%s, %s, %s)',
+            [
+                (i, f'Категория {i}', f'category-{i}')
+                for i in range(CATEGORIES)
+            ]
+        )
+        cursor.executemany(
+            'INSERT INTO reviews_genre (id, name, slug) VALUES (%s, %s, %s)',
+            [(i, f'Жанр {i}', f'genre-{i}') for i in range(GENRES)]
+        )
+        for start in range(0, count, BATCH_SIZE):
+            ids = range(start + 1, min(start + BATCH_SIZE, count) + 1)
+            cursor.executemany(
+                'INSERT INTO reviews_title (id, name, year, description, '
+                'category_id, rating_sum, rating_count) '
+                "VALUES (%s, %s, %s, '', %s, 0, 0)",
+                [
+                    (
+                        pk, f'Произведение {rng.getrandbits(40):x}',
+                        rng.randint(1900, 2024), rng.randrange(CATEGORIES),
+                    )
+                    for pk in ids
+                ]
+            )
+            cursor.executemany(
+                'INSERT INTO reviews_title_genre (title_id, genre_id) '
+                'VALUES (%s, %s)',
+                [
+                    (pk, genre)
+                    for pk in ids
+                    for genre in rng.sample(range(GENRES), rng.randint(1, 3))
+                ]
+            )
+
+
+def measure(repeat):
+    from django.db import connection
+
+    from api.filters import TitleFilter
+    from api.views import TitleViewSet
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    results = []
+    for data in FILTERS:
+        queryset = TitleFilter(data, queryset=TitleViewSet.queryset).qs
+        page = queryset.values_list('id', flat=True)[:10]
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset.count()
+            list(page)
+            timings.append(time.perf_counter() - started)
+        results.append((data, page.explain(), min(timings)))
+    return results
+
+
+def report(title, results):
+    print(f'== {title}')
+    for data, plan, seconds in results:
+        params = '&'.join(f'{key}={value}' for key, value in data.items())
+        print(
+            f'\n?{params}: {seconds * 1000:.1f} ms '
+            '(count + первая страница)'
+        )
+        for line in plan.splitlines():
+            print(f'    {line}')
+    print()
+
+
+def main():
+    args = parse_args()
+    with django_database(args.database):
+        from django.core.management import call_command
+
+        call_command('migrate', 'reviews', '0007', verbosity=0)
+        started = time.perf_counter()
+        seed(args.titles)
+        print(
+            f'{args.titles} произведений записано за '
+            f'{time.perf_counter() - started:.1f} с\n'
+        )
+        report('без индексов (0007)', measure(args.repeat))
+        call_command('migrate', 'reviews', '0008', verbosity=0)
+        report('с индексами (0008)', measure(args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+@contextmanager
+def django_database(path=None):
+    """Настраивает Django на файл SQLite `path` или временный файл."""
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    from django.conf import settings
+
+    database = path
+    if database is None:
+        handle, database = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+    settings.DATABASES['default']['NAME'] = database
+    django.setup()
+    try:
+        yield database
+    finally:
+        if path is None:
+            os.remove(database)
@@ -0,0 +1,21 @@
+import pytest
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@pytest.fixture(params=('orjson', 'json'))
+def json_library(request, monkeypatch):
+    """Тест выполняется с рендерером и парсером на orjson и на json.
+
+    Подключается в модулях с тестами эндпоинтов через
+    `pytestmark = pytest.mark.usefixtures('json_library')`.
+    """
+    if request.param == 'json':
+        monkeypatch.setattr('api.renderers.orjson', None)
+        monkeypatch.setattr('api.parsers.orjson', None)
+    elif orjson is None:
+        pytest.skip('orjson не установлен')
+    return request.param
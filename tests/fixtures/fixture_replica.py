@@ -0,0 +1,32 @@
+import os
+import tempfile
+
+import pytest
+from django.conf import settings
+
+# Реплика-зеркало основной тестовой базы: в тестах она видит те же данные,
+# но запросы к ней идут через отдельное подключение.
+settings.DATABASES.setdefault('replica', {
+    **settings.DATABASES['default'],
+    'TEST': {'MIRROR': 'default'},
+})
+
+# Реплика в отдельном файле: данные в нее попадают только при синхронизации.
+REPLICA_FILE = os.path.join(tempfile.gettempdir(), 'yamdb_test_replica.db')
+settings.DATABASES.setdefault('replica_file', {
+    **settings.DATABASES['default'],
+    'NAME': REPLICA_FILE,
+    'TEST': {'NAME': REPLICA_FILE},
+})
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+    return 'replica'
+
+
+@pytest.fixture
+def replica_file(settings):
+    settings.DATABASE_REPLICAS = ['replica_file']
+    return 'replica_file'
@@ -5,6 +5,8 @@ import pytest
 from tests.utils import (check_pagination,
                          invalid_data_for_user_patch_and_creation)
 
+pytestmark = pytest.mark.usefixtures('json_library')
+
 
 @pytest.mark.django_db(transaction=True)
 class Test01UserAPI:
@@ -5,6 +5,8 @@ import pytest
 from tests.utils import (check_name_and_slug_patterns, check_pagination,
                          check_permissions, create_genre)
 
+pytestmark = pytest.mark.usefixtures('json_library')
+
 
 @pytest.mark.django_db(transaction=True)
 class Test03GenreAPI:
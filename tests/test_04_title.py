@@ -5,6 +5,8 @@ import pytest
 from tests.utils import (check_pagination, check_permissions,
                          create_categories, create_genre, create_titles)
 
+pytestmark = pytest.mark.usefixtures('json_library')
+
 
 @pytest.mark.django_db(transaction=True)
 class Test04TitleAPI:
@@ -6,6 +6,8 @@ from django.db.utils import IntegrityError
 from tests.utils import (check_fields, check_pagination, create_reviews,
                          create_single_review, create_titles)
 
+pytestmark = pytest.mark.usefixtures('json_library')
+
 
 @pytest.mark.django_db(transaction=True)
 class Test05ReviewAPI:
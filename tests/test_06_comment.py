@@ -5,6 +5,8 @@ import pytest
 from tests.utils import (check_fields, check_pagination, create_comments,
                          create_reviews, create_single_comment)
 
+pytestmark = pytest.mark.usefixtures('json_library')
+
 
 @pytest.mark.django_db(transaction=True)
 class Test06CommentAPI:
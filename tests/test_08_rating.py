@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        review = create_single_review(admin_client, title_id, 'text', 2)
+        create_single_review(user_client, title_id, 'text', 6)
+        assert self.get_rating(admin_client, title_id) == 4, (
+            'Проверьте, что после создания отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+        response = admin_client.patch(
+            f'{url}{review.json()["id"]}/', data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Проверьте, что после изменения оценки в отзыве рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        response = admin_client.delete(f'{url}{review.json()["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что после удаления отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+        assert self.get_rating(admin_client, titles[1]['id']) is None, (
+            'Проверьте, что отзывы не влияют на рейтинг других произведений.'
+        )
+
+    def test_02_recalculate_ratings_command(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'text', 3)
+        create_single_review(user_client, title_id, 'text', 8)
+        Title.objects.update(rating_sum=0, rating_count=0)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (11, 2), (
+            'Проверьте, что команда `recalculate_ratings` пересчитывает '
+            'рейтинг произведений по отзывам.'
+        )
+        assert Title.objects.get(pk=titles[1]['id']).rating_count == 0
+
+    def test_03_duplicate_review_keeps_rating(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'text', 4)
+
+        response = admin_client.post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            data={'text': 'text', 'score': 10}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на произведение '
+            'возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Можно оставлять только один отзыв!']
+        }
+        assert self.get_rating(admin_client, title_id) == 4, (
+            'Проверьте, что отклоненный отзыв не влияет на рейтинг '
+            'произведения.'
+        )
+
+    def test_04_stale_review_instances(self, admin_client):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            admin_client, title_id, 'text', 4
+        ).json()['id']
+        first = Review.objects.get(pk=review_id)
+        second = Review.objects.get(pk=review_id)
+        first.score = 6
+        first.save()
+        second.score = 9
+        second.save()
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (9, 1), (
+            'Проверьте, что изменение оценки учитывает сохраненное в базе '
+            'значение, а не загруженное вместе с объектом.'
+        )
+
+    def test_05_other_integrity_errors(self, admin_client, monkeypatch):
+        from django.db import IntegrityError
+
+        from reviews.models import TitleQuerySet
+
+        def fail(*args, **kwargs):
+            raise IntegrityError('rating')
+
+        titles, _, _ = create_titles(admin_client)
+        monkeypatch.setattr(TitleQuerySet, 'shift_rating', fail)
+        with pytest.raises(IntegrityError):
+            admin_client.post(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                data={'text': 'text', 'score': 5}
+            )
@@ -0,0 +1,121 @@
+import pytest
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+QUERY_BUDGETS = (
+    ('/api/v1/titles/', 3),
+    ('/api/v1/titles/{title_id}/', 2),
+    ('/api/v1/categories/', 2),
+    ('/api/v1/genres/', 2),
+    ('/api/v1/titles/{title_id}/reviews/', 3),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/', 2),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/comments/', 3),
+)
+
+
+@pytest.fixture
+def catalogue(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        for idx in range(12)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre{idx}')
+        for idx in range(3)
+    ]
+    titles = []
+    for idx in range(12):
+        category = Category.objects.create(
+            name=f'Категория {idx}', slug=f'category{idx}'
+        )
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='text', score=5
+        )
+        for author in authors
+    ]
+    for author in authors:
+        Comment.objects.create(review=reviews[0], author=author, text='text')
+    return titles[0], reviews[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryBudget:
+
+    @pytest.mark.parametrize('url,budget', QUERY_BUDGETS)
+    def test_01_read_endpoints_query_budget(self, client, catalogue,
+                                            django_assert_max_num_queries,
+                                            url, budget):
+        title, review = catalogue
+        url = url.format(title_id=title.id, review_id=review.id)
+        with django_assert_max_num_queries(budget):
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+
+    def test_02_nested_post_query_budget(self, user_client, catalogue,
+                                         django_assert_max_num_queries):
+        title, review = catalogue
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        # Отзыв, рейтинг и статистика произведения.
+        with django_assert_max_num_queries(6):
+            response = user_client.post(url, data={'text': 'text', 'score': 5})
+        assert response.status_code == 201, (
+            f'Проверьте, что POST-запрос к `{url}` с корректными данными '
+            'возвращает ответ со статусом 201.'
+        )
+
+        url = f'{url}{review.id}/comments/'
+        # Комментарий и статистика произведения в одной транзакции.
+        with django_assert_max_num_queries(5):
+            response = user_client.post(url, data={'text': 'text'})
+        assert response.status_code == 201, (
+            f'Проверьте, что POST-запрос к `{url}` с корректными данными '
+            'возвращает ответ со статусом 201.'
+        )
+
+    def test_03_comments_of_review_from_other_title(self, client, catalogue):
+        from reviews.models import Title
+
+        _, review = catalogue
+        other_title = Title.objects.exclude(pk=review.title_id).first()
+        url = f'/api/v1/titles/{other_title.id}/reviews/{review.id}/comments/'
+        response = client.get(url)
+        assert response.status_code == 404, (
+            'Проверьте, что запрос к комментариям отзыва, указанного с '
+            'чужим `title_id`, возвращает ответ со статусом 404.'
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('data, index', (
+    ({'year': '2000'}, 'title_year_name_idx'),
+    ({'category': 'books', 'year': '2000'}, 'title_category_year_name_idx'),
+    ({'genre': 'rock'}, 'title_genre_genre_title_idx'),
+))
+def test_04_title_filters_use_indexes(data, index):
+    from django.db import connection
+
+    from api.filters import TitleFilter
+    from api.views import TitleViewSet
+
+    if connection.vendor != 'sqlite':
+        pytest.skip('План запроса проверяется для SQLite')
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    plan = TitleFilter(data, queryset=TitleViewSet.queryset).qs.explain()
+    assert index in plan, (
+        f'Проверьте, что фильтр произведений {data} использует индекс '
+        f'`{index}`.'
+    )
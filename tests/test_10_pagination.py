@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def collect_pages(self, client, url):
+        results = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации ответ не '
+                'содержит ключ `count`.'
+            )
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    def test_01_reviews_cursor_pages(self, client, django_user_model):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        for idx in range(13):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text='text', score=5
+            )
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        response = client.get(url)
+        assert response.json()['count'] == 13, (
+            'Проверьте, что без параметра `pagination` используется '
+            'постраничная пагинация.'
+        )
+
+        results = self.collect_pages(client, f'{url}?pagination=cursor')
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+        assert [review['id'] for review in results] == expected, (
+            f'Проверьте, что курсорная пагинация `{url}?pagination=cursor` '
+            'возвращает все отзывы по одному разу в порядке публикации.'
+        )
+
+    def test_02_titles_cursor_pages(self, client):
+        from reviews.models import Title
+
+        for idx in range(12):
+            Title.objects.create(name=f'Произведение {idx:02}', year=2000)
+
+        results = self.collect_pages(client, '/api/v1/titles/?pagination=cursor')
+        assert [title['name'] for title in results] == sorted(
+            Title.objects.values_list('name', flat=True)
+        ), (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` '
+            'возвращает произведения по одному разу, упорядоченными '
+            'по названию.'
+        )
@@ -0,0 +1,151 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ImportCsv:
+
+    @pytest.mark.parametrize('workers', (1, 3))
+    def test_01_import_csv(self, django_user_model, workers):
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        call_command('import_csv', batch_size=7, workers=workers)
+
+        expected = (
+            (django_user_model, 5),
+            (Category, 3),
+            (Genre, 15),
+            (Title, 32),
+            (Review, 72),
+            (Title.genre.through, 42),
+            (Comment, 3),
+        )
+        for model, count in expected:
+            assert model.objects.count() == count, (
+                'Проверьте, что команда `import_csv` загружает все строки '
+                f'в модель `{model.__name__}`.'
+            )
+        title = Title.objects.get(pk=1)
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert (title.rating_sum, title.rating_count) == (
+            sum(scores), len(scores)
+        ), (
+            'Проверьте, что после загрузки отзывов команда `import_csv` '
+            'пересчитывает рейтинг произведений.'
+        )
+
+    def test_02_import_csv_upsert(self, tmp_path):
+        from io import StringIO
+
+        from django.conf import settings
+        from reviews.models import Category, Review
+
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for csv_file in data_dir.glob('*.csv'):
+            (tmp_path / csv_file.name).write_bytes(csv_file.read_bytes())
+        call_command('import_csv', path=tmp_path)
+
+        category = tmp_path / 'category.csv'
+        category.write_text(
+            category.read_text(encoding='utf-8-sig').replace(
+                'Фильм', 'Кино'
+            ) + '\n4,Игра,game',
+            encoding='utf-8'
+        )
+        out = StringIO()
+        call_command('import_csv', path=tmp_path, upsert=True, stdout=out)
+
+        report = out.getvalue()
+        assert 'category.csv: 1 inserted, 1 updated, 2 unchanged' in report, (
+            'Проверьте, что команда `import_csv --upsert` сообщает '
+            'количество добавленных, обновленных и неизмененных строк.'
+        )
+        assert 'review.csv: 0 inserted, 0 updated, 72 unchanged' in report
+        assert Category.objects.get(pk=1).name == 'Кино'
+        assert Category.objects.get(slug='game').pk == 4
+        assert Review.objects.count() == 72
+
+    def test_03_import_csv_incremental(self, tmp_path):
+        from io import StringIO
+
+        from django.conf import settings
+        from reviews.models import Comment, ImportCheckpoint
+
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for csv_file in data_dir.glob('*.csv'):
+            (tmp_path / csv_file.name).write_bytes(csv_file.read_bytes())
+        call_command('import_csv', path=tmp_path, stdout=StringIO())
+        checkpoint = ImportCheckpoint.objects.get(filename='comments.csv')
+        assert checkpoint.last_id == 3, (
+            'Проверьте, что команда `import_csv` сохраняет отметку '
+            'загрузки с последним загруженным `id`.'
+        )
+
+        with open(tmp_path / 'comments.csv', 'a', encoding='utf-8') as file:
+            file.write(
+                '\n4,1,"Новый\nкомментарий",100,2020-01-13T23:20:02.422Z'
+                '\n5,1,Еще один,101,2020-01-13T23:20:02.422Z\n'
+            )
+        out = StringIO()
+        call_command('import_csv', path=tmp_path, incremental=True, stdout=out)
+
+        report = out.getvalue()
+        assert 'comments.csv: 2 rows loaded' in report, (
+            'Проверьте, что команда `import_csv --incremental` загружает '
+            'только строки, добавленные после предыдущего запуска.'
+        )
+        assert 'review.csv: 0 rows loaded' in report
+        assert Comment.objects.get(pk=4).text == 'Новый\nкомментарий'
+        assert ImportCheckpoint.objects.get(
+            filename='comments.csv'
+        ).offset == (tmp_path / 'comments.csv').stat().st_size
+
+        (tmp_path / 'genre.csv').write_text(
+            'id,name,slug\n100,Новый жанр,new-genre', encoding='utf-8'
+        )
+        out = StringIO()
+        call_command('import_csv', path=tmp_path, incremental=True, stdout=out)
+        assert 'genre.csv: 1 rows loaded' in out.getvalue(), (
+            'Проверьте, что при изменении уже загруженной части файла '
+            'команда `import_csv --incremental` перечитывает его целиком, '
+            'пропуская строки с уже загруженными `id`.'
+        )
+
+    def test_04_incremental_recalculates_touched_titles(self, tmp_path):
+        from io import StringIO
+
+        from django.conf import settings
+        from reviews.models import Title, TitleStatistics
+
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for csv_file in data_dir.glob('*.csv'):
+            (tmp_path / csv_file.name).write_bytes(csv_file.read_bytes())
+        call_command('import_csv', path=tmp_path, stdout=StringIO())
+        # Испорченные значения покажут, пересчитывалось ли произведение.
+        Title.objects.filter(pk=2).update(rating_sum=0, rating_count=0)
+        TitleStatistics.objects.filter(title_id=2).update(comment_count=99)
+
+        call_command(
+            'import_csv', path=tmp_path, incremental=True, stdout=StringIO()
+        )
+        assert Title.objects.get(pk=2).rating_count == 0, (
+            'Проверьте, что команда `import_csv --incremental` без новых '
+            'строк не пересчитывает рейтинг всех произведений.'
+        )
+
+        with open(tmp_path / 'review.csv', 'a', encoding='utf-8') as file:
+            file.write('\n76,32,Отзыв,100,4,2020-01-13T23:20:02.422Z\n')
+        call_command(
+            'import_csv', path=tmp_path, incremental=True, stdout=StringIO()
+        )
+        title = Title.objects.get(pk=32)
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert (title.rating_sum, title.rating_count) == (
+            sum(scores), len(scores)
+        ), (
+            'Проверьте, что команда `import_csv --incremental` пересчитывает '
+            'рейтинг произведений загруженных отзывов.'
+        )
+        assert title.statistics.score_4 == scores.count(4)
+        assert Title.objects.get(pk=2).rating_count == 0
+        assert TitleStatistics.objects.get(title_id=2).comment_count == 99
@@ -0,0 +1,72 @@
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12OutgoingEmail:
+    url_signup = '/api/v1/auth/signup/'
+    valid_data = {
+        'email': 'valid@yamdb.fake',
+        'username': 'valid_username'
+    }
+
+    def test_01_signup_queues_email(self, client):
+        from reviews.models import OutgoingEmail
+
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.url_signup, data=self.valid_data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.url_signup}` не '
+            'отправляет письмо сам, а ставит его в очередь.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == self.valid_data['email']
+
+        call_command('send_emails')
+
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_emails` отправляет письма '
+            'из очереди.'
+        )
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_failed_email_is_retried_later(self, client, monkeypatch):
+        from django.core.mail import EmailMessage
+        from django.utils import timezone
+        from reviews.models import OutgoingEmail
+
+        def fail(*args, **kwargs):
+            raise SMTPException('connection lost')
+
+        client.post(self.url_signup, data=self.valid_data)
+        monkeypatch.setattr(EmailMessage, 'send', fail)
+        call_command('send_emails', retry_delay=60)
+
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert email.last_error == 'connection lost'
+        assert email.send_after > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается до '
+            'следующей попытки.'
+        )
+        monkeypatch.undo()
+
+        outbox_before_count = len(mail.outbox)
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что письмо не отправляется раньше срока повторной '
+            'попытки.'
+        )
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1
@@ -0,0 +1,161 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13StatelessAuth:
+    url_token = '/api/v1/auth/token/'
+    url_users = '/api/v1/users/'
+
+    def get_client(self, client, user):
+        response = client.post(self.url_token, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token_client = APIClient()
+        token_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["access"]}'
+        )
+        return token_client
+
+    def test_01_token_user_without_query(self, client, admin,
+                                         django_assert_max_num_queries):
+        admin_client = self.get_client(client, admin)
+        response = admin_client.get(self.url_users)
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_max_num_queries(2):
+            response = admin_client.get(self.url_users)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что запрос с токеном, содержащим роль '
+            'пользователя, не загружает пользователя из базы.'
+        )
+
+        response = admin_client.get(f'{self.url_users}me/')
+        assert response.json()['email'] == admin.email
+
+    def test_02_role_change_revokes_token(self, client, admin):
+        admin_client = self.get_client(client, admin)
+        assert admin_client.get(self.url_users).status_code == HTTPStatus.OK
+
+        admin.role = admin.USER
+        admin.save()
+
+        response = admin_client.get(self.url_users)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после изменения роли пользователя выданный '
+            'ранее токен отклоняется.'
+        )
+        user_client = self.get_client(client, admin)
+        response = user_client.get(self.url_users)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_author_from_token(self, client, user, admin_client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        user_client = self.get_client(client, user)
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'text', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        response = user_client.patch(
+            f'/api/v1/titles/{title.id}/reviews/{response.json()["id"]}/',
+            data={'score': 7}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор с токеном без обращения к базе может '
+            'изменять свой отзыв.'
+        )
+
+    def test_04_queryset_update_revokes_token(self, client, admin):
+        from django.core.cache import cache
+
+        from reviews.models import User
+
+        admin_client = self.get_client(client, admin)
+        User.objects.filter(pk=admin.pk).update(bio='bio', role=admin.ADMIN)
+        assert User.objects.get(pk=admin.pk).auth_version == 0, (
+            'Проверьте, что update() без изменения прав не отзывает токены.'
+        )
+        User.objects.filter(pk=admin.pk).update(role=admin.USER)
+        # Версия прав кешируется на AUTH_VERSION_CACHE_TIMEOUT.
+        cache.clear()
+        response = admin_client.get(self.url_users)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменение роли через update() отклоняет '
+            'выданные ранее токены.'
+        )
+
+    def test_05_upsert_revokes_token(self, client, tmp_path):
+        from io import StringIO
+
+        from django.conf import settings
+        from django.core.cache import cache
+        from django.core.management import call_command
+
+        from reviews.models import User
+
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for csv_file in data_dir.glob('*.csv'):
+            (tmp_path / csv_file.name).write_bytes(csv_file.read_bytes())
+        call_command('import_csv', path=tmp_path, stdout=StringIO())
+        admin_client = self.get_client(client, User.objects.get(pk=101))
+        assert admin_client.get(self.url_users).status_code == HTTPStatus.OK
+
+        users = tmp_path / 'users.csv'
+        # Роль меняется у 101, у 100 — только биография.
+        users.write_text(
+            users.read_text(encoding='utf-8-sig').replace(
+                'obvious@yamdb.fake,admin,', 'obvious@yamdb.fake,user,'
+            ).replace(
+                'bongo@yamdb.fake,user,,', 'bongo@yamdb.fake,user,bio,'
+            ),
+            encoding='utf-8'
+        )
+        call_command(
+            'import_csv', path=tmp_path, upsert=True, stdout=StringIO()
+        )
+        cache.clear()
+        assert dict(User.objects.values_list('pk', 'auth_version')) == {
+            100: 0, 101: 1, 102: 0, 103: 0, 104: 0
+        }, (
+            'Проверьте, что `import_csv --upsert` увеличивает auth_version '
+            'только у пользователей с измененными правами.'
+        )
+        response = admin_client.get(self.url_users)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_06_renamed_author(self, client, user, admin_client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        user_client = self.get_client(client, user)
+        response = admin_client.patch(
+            f'{self.url_users}{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'text', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == 'renamed', (
+            'Проверьте, что после смены имени пользователя ответы на его '
+            'запросы с выданным ранее токеном содержат новое имя.'
+        )
+        review_id = response.json()['id']
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/{review_id}/comments/',
+            data={'text': 'comment'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == 'renamed'
@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ResponseCache:
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_cached_read_without_queries(self, client, admin_client,
+                                            django_assert_num_queries):
+        create_titles(admin_client)
+        for url in ('/api/v1/titles/', '/api/v1/genres/',
+                    '/api/v1/categories/', '/api/v1/titles/?year=1984'):
+            first = self.get(client, url)
+            with django_assert_num_queries(0):
+                second = self.get(client, url)
+            assert first == second, (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'возвращает закешированный ответ без запросов к базе.'
+            )
+
+    def test_02_invalidation(self, client, admin_client):
+        from reviews.models import Category, Genre, Title
+
+        titles, categories, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/'
+        assert self.get(client, url)['rating'] is None
+        self.get(client, '/api/v1/titles/')
+
+        create_single_review(admin_client, title_id, 'text', 7)
+        assert self.get(client, url)['rating'] == 7, (
+            'Проверьте, что кеш произведения сбрасывается после создания '
+            'отзыва.'
+        )
+        results = self.get(client, '/api/v1/titles/')['results']
+        assert {title['rating'] for title in results} == {None, 7}
+
+        category = Category.objects.get(slug=categories[0]['slug'])
+        category.name = 'Кино'
+        category.save()
+        assert self.get(client, url)['category']['name'] == 'Кино', (
+            'Проверьте, что кеш произведений сбрасывается после изменения '
+            'категории.'
+        )
+
+        genre = Genre.objects.get(slug=genres[2]['slug'])
+        Title.objects.get(pk=title_id).genre.add(genre)
+        assert genres[2]['slug'] in {
+            item['slug'] for item in self.get(client, url)['genre']
+        }, (
+            'Проверьте, что кеш произведения сбрасывается после изменения '
+            'его жанров.'
+        )
+        genre.title_set.clear()
+        assert genres[2]['slug'] not in {
+            item['slug'] for item in self.get(client, url)['genre']
+        }, (
+            'Проверьте, что кеш произведения сбрасывается, когда жанр '
+            'убирают у всех произведений.'
+        )
+
+        admin_client.delete(f'/api/v1/genres/{genres[2]["slug"]}/')
+        assert genres[2]['slug'] not in {
+            item['slug'] for item in self.get(client, '/api/v1/genres/')[
+                'results'
+            ]
+        }
+
+    def test_03_user_changes(self, client, admin_client, user):
+        from api.cache import get_versions
+
+        def users_version():
+            return get_versions(['users'])[0]
+
+        version = users_version()
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        user.bio = 'Новая биография'
+        user.save()
+        assert users_version() == version, (
+            'Проверьте, что регистрация и изменения пользователя без смены '
+            'имени не сбрасывают кеш отзывов и комментариев.'
+        )
+        user.username = 'renamed'
+        user.save()
+        assert users_version() != version, (
+            'Проверьте, что смена имени пользователя сбрасывает кеш отзывов '
+            'и комментариев.'
+        )
+
+    def test_04_import_csv_invalidation(self, client, tmp_path):
+        from io import StringIO
+
+        from django.conf import settings
+        from django.core.management import call_command
+
+        data_dir = settings.BASE_DIR / 'static' / 'data'
+        for csv_file in data_dir.glob('*.csv'):
+            (tmp_path / csv_file.name).write_bytes(csv_file.read_bytes())
+        call_command('import_csv', path=tmp_path, stdout=StringIO())
+        reviews_url = '/api/v1/titles/32/reviews/'
+        count = self.get(client, reviews_url)['count']
+        self.get(client, '/api/v1/categories/')
+
+        with open(tmp_path / 'review.csv', 'a', encoding='utf-8') as file:
+            file.write('\n76,32,Отзыв,100,4,2020-01-13T23:20:02.422Z\n')
+        category = tmp_path / 'category.csv'
+        category.write_text(
+            category.read_text(encoding='utf-8-sig').replace('Фильм', 'Кино'),
+            encoding='utf-8'
+        )
+        call_command(
+            'import_csv', path=tmp_path, upsert=True, stdout=StringIO()
+        )
+        assert self.get(client, reviews_url)['count'] == count + 1, (
+            'Проверьте, что после `import_csv` кеш отзывов загруженных '
+            'произведений сбрасывается.'
+        )
+        assert 'Кино' in {
+            category['name']
+            for category in self.get(client, '/api/v1/categories/')['results']
+        }
@@ -0,0 +1,124 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_comment
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    def test_01_not_modified(self, client, admin_client, user, moderator,
+                             user_client, moderator_client,
+                             django_assert_num_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.has_header('ETag'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок `ETag`.'
+            )
+            assert response.has_header('Last-Modified')
+            with django_assert_num_queries(0):
+                not_modified = client.get(
+                    url, HTTP_IF_NONE_MATCH=response['ETag']
+                )
+            assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает ответ со статусом 304.'
+            )
+            assert not_modified['ETag'] == response['ETag']
+            not_modified = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+            assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_02_modified(self, client, admin_client, user, moderator,
+                         user_client, moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        etags = {
+            url: client.get(url)['ETag']
+            for url in (reviews_url, comments_url, '/api/v1/titles/')
+        }
+
+        create_single_comment(admin_client, title_id, review_id, 'new')
+        for url, changed in (
+            (comments_url, True), (reviews_url, False),
+            ('/api/v1/titles/', False),
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            expected = HTTPStatus.OK if changed else HTTPStatus.NOT_MODIFIED
+            assert response.status_code == expected, (
+                f'Проверьте, что после добавления комментария GET-запрос к '
+                f'`{url}` с прежним ETag возвращает статус {expected}.'
+            )
+
+        response = admin_client.patch(
+            f'{reviews_url}{review_id}/', data={'score': 9}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url in etags:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после изменения отзыва GET-запрос к `{url}` '
+                'с прежним ETag возвращает обновленные данные.'
+            )
+
+        etag = client.get(reviews_url)['ETag']
+        user.username = 'renamed'
+        user.save()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после переименования автора GET-запрос к списку '
+            'отзывов с прежним ETag возвращает обновленные данные.'
+        )
+        assert 'renamed' in {
+            review['author'] for review in response.json()['results']
+        }
+
+    def test_03_missing_resource(self, client, admin_client, user,
+                                 user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        response = client.get('/api/v1/titles/')
+        for url in (
+            '/api/v1/titles/100500/',
+            '/api/v1/titles/100500/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/100500/',
+            f'/api/v1/titles/{title_id}/reviews/100500/comments/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/100500/',
+        ):
+            for headers in (
+                {'HTTP_IF_NONE_MATCH': '*'},
+                {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+            ):
+                assert client.get(url, **headers).status_code == (
+                    HTTPStatus.NOT_FOUND
+                ), (
+                    f'Проверьте, что условный GET-запрос к `{url}` '
+                    'несуществующего ресурса возвращает ответ со статусом '
+                    '404.'
+                )
+        response = client.get(
+            f'/api/v1/titles/{title_id}/', HTTP_IF_NONE_MATCH='*'
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
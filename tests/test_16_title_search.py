@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+from importlib import import_module
+
+import pytest
+from django.db import OperationalError, connection
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleSearch:
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Title
+
+        return Title.objects.bulk_create([
+            Title(name='Война и мир', year=1869,
+                  description='Роман-эпопея о войне 1812 года'),
+            Title(name='Star Wars', year=1977, description='Space opera'),
+            Title(name='Мир Дикого Запада', year=2016,
+                  description='Сериал о парке развлечений'),
+            Title(name='Парк юрского периода', year=1993,
+                  description='Фильм о динозаврах и мире будущего'),
+        ])
+
+    def get_names(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    @pytest.mark.parametrize('value', ('Wars', 'мир', 'ир', 'a W', 'x'))
+    def test_01_name_filter(self, client, titles, value):
+        from reviews.models import Title
+
+        expected = sorted(
+            Title.objects.filter(name__contains=value).values_list(
+                'name', flat=True
+            )
+        )
+        assert sorted(self.get_names(client, f'name={value}')) == expected, (
+            'Проверьте, что фильтр `name` находит произведения по подстроке '
+            'в названии.'
+        )
+
+    def test_02_search_is_ranked(self, client, titles):
+        assert self.get_names(client, 'search=мир') == [
+            'Война и мир', 'Мир Дикого Запада', 'Парк юрского периода'
+        ], (
+            'Проверьте, что `?search=` находит слова по началу без учета '
+            'регистра и выводит совпадения в названии выше совпадений в '
+            'описании.'
+        )
+        assert self.get_names(client, 'search=парк мир') == [
+            'Мир Дикого Запада', 'Парк юрского периода'
+        ]
+        assert self.get_names(client, 'search=st') == ['Star Wars']
+        assert self.get_names(client, 'search="') == []
+
+    def test_03_index_follows_writes(self, client, titles):
+        from reviews.models import Title
+
+        title = Title.objects.get(name='Star Wars')
+        title.name = 'Звездные войны'
+        title.save()
+        Title.objects.filter(name='Война и мир').delete()
+        assert self.get_names(client, 'search=войн') == ['Звездные войны']
+        assert self.get_names(client, 'name=Wars') == []
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='FTS5 используется в SQLite'
+    )
+    def test_04_name_filter_uses_index(self, titles):
+        from api.search import get_search_backend
+        from reviews.models import Title
+
+        queryset = get_search_backend().filter_name(Title.objects, 'Wars')
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            plan = ' '.join(
+                str(row[-1]) for row in cursor.execute(
+                    f'EXPLAIN QUERY PLAN {sql}', params
+                ).fetchall()
+            )
+        assert 'reviews_title_fts VIRTUAL TABLE' in plan
+        assert 'SCAN reviews_title ' not in f'{plan} '
+
+    def test_05_without_index(self, client, titles, monkeypatch):
+        from api.search import (SearchBackend, SQLiteSearchBackend,
+                                get_search_backend)
+
+        monkeypatch.setattr(SQLiteSearchBackend, 'table', 'missing_fts')
+        monkeypatch.setattr(SQLiteSearchBackend, 'available', {})
+        assert type(get_search_backend()) is SearchBackend, (
+            'Проверьте, что без таблицы полнотекстового индекса поиск '
+            'выполняется без него.'
+        )
+        assert self.get_names(client, 'search=wars') == ['Star Wars']
+        assert self.get_names(client, 'name=Wars') == ['Star Wars']
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='FTS5 используется в SQLite'
+    )
+    def test_06_migration_without_fts5(self, monkeypatch):
+        migration = import_module('reviews.migrations.0007_title_search')
+        executed = []
+
+        def execute(sql, params=()):
+            if 'fts5' in sql:
+                raise OperationalError('no such module: fts5')
+            executed.append(sql)
+
+        with connection.schema_editor() as schema_editor:
+            assert migration.fts5_trigram_supported(schema_editor)
+            monkeypatch.setattr(schema_editor, 'execute', execute)
+            migration.create_index(None, schema_editor)
+        assert executed == [], (
+            'Проверьте, что миграция 0007 не создает индекс, если SQLite '
+            'не поддерживает FTS5 с токенизатором trigram.'
+        )
+
+    def test_07_search_with_cursor_pagination(self, client, titles):
+        response = client.get('/api/v1/titles/?search=мир&pagination=cursor')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что `?search=` вместе с курсорной пагинацией, '
+            'которая не сохраняет сортировку по релевантности, возвращает '
+            'ответ со статусом 400.'
+        )
+        assert 'search' in response.json()
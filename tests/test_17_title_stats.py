@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+def expected_scores(**counts):
+    return {
+        str(score): counts.get(f's{score}', 0) for score in range(1, 11)
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleStats:
+
+    def get_stats(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/stats/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/stats/` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_stats_follow_reviews_and_comments(
+            self, client, admin_client, user_client, moderator_client,
+            django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        assert self.get_stats(client, title_id) == {
+            'reviews': 0, 'comments': 0, 'rating': None,
+            'scores': expected_scores(),
+        }
+
+        review = create_single_review(admin_client, title_id, 'text', 2)
+        review_id = review.json()['id']
+        create_single_review(user_client, title_id, 'text', 6)
+        create_single_review(moderator_client, titles[1]['id'], 'text', 9)
+        create_single_comment(user_client, title_id, review_id, 'comment')
+        create_single_comment(admin_client, title_id, review_id, 'comment')
+        with django_assert_max_num_queries(1):
+            stats = self.get_stats(client, title_id)
+        assert stats == {
+            'reviews': 2, 'comments': 2, 'rating': 4,
+            'scores': expected_scores(s2=1, s6=1),
+        }, (
+            'Проверьте, что статистика произведения учитывает оценки отзывов '
+            'и комментарии к ним.'
+        )
+
+        response = admin_client.patch(
+            f'{url}{review_id}/', data={'score': 6}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_stats(client, title_id)['scores'] == (
+            expected_scores(s6=2)
+        )
+
+        response = admin_client.delete(f'{url}{review_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_stats(client, title_id) == {
+            'reviews': 1, 'comments': 0, 'rating': 6,
+            'scores': expected_scores(s6=1),
+        }, (
+            'Проверьте, что после удаления отзыва статистика не учитывает '
+            'его оценку и комментарии.'
+        )
+        assert self.get_stats(client, titles[1]['id'])['scores'] == (
+            expected_scores(s9=1)
+        )
+
+    def test_02_stats_rebuild(self, client, admin_client, user_client):
+        from reviews.models import TitleStatistics
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(admin_client, title_id, 'text', 3)
+        create_single_comment(
+            user_client, title_id, review.json()['id'], 'comment'
+        )
+        TitleStatistics.objects.all().delete()
+        create_single_review(user_client, title_id, 'text', 8)
+        assert self.get_stats(client, title_id) == {
+            'reviews': 2, 'comments': 1, 'rating': 5,
+            'scores': expected_scores(s3=1, s8=1),
+        }, (
+            'Проверьте, что отсутствующая статистика строится по '
+            'сохраненным отзывам.'
+        )
+
+        TitleStatistics.objects.update(score_3=0, comment_count=5)
+        call_command('recalculate_ratings')
+        assert self.get_stats(client, title_id)['scores'] == (
+            expected_scores(s3=1, s8=1)
+        )
+        assert self.get_stats(client, title_id)['comments'] == 1
+
+    def test_03_stats_of_missing_title(self, client):
+        response = client.get('/api/v1/titles/1/stats/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_stats_created_with_title(self, client, admin_client,
+                                         monkeypatch):
+        from reviews.models import TitleStatistics, TitleStatisticsQuerySet
+
+        titles, _, _ = create_titles(admin_client)
+        assert TitleStatistics.objects.filter(
+            title_id__in=[title['id'] for title in titles]
+        ).count() == len(titles), (
+            'Проверьте, что статистика создается вместе с произведением.'
+        )
+
+        title_id = titles[0]['id']
+        TitleStatistics.objects.all().delete()
+        calculate = TitleStatisticsQuerySet.calculate
+
+        def calculate_concurrently(self, titles):
+            # Параллельная транзакция создает строку без этого отзыва.
+            calculated = calculate(self, titles)
+            TitleStatistics.objects.create(title_id=title_id)
+            return calculated
+
+        monkeypatch.setattr(
+            TitleStatisticsQuerySet, 'calculate', calculate_concurrently
+        )
+        create_single_review(admin_client, title_id, 'text', 6)
+        assert self.get_stats(client, title_id)['scores'] == (
+            expected_scores(s6=1)
+        ), (
+            'Проверьте, что статистика, созданная параллельно, учитывает '
+            'новый отзыв.'
+        )
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_review, create_titles
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18SparseFields:
+
+    def test_01_titles_fields(self, client, admin_client,
+                              django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'text', 8)
+        url = '/api/v1/titles/?fields=id,name,rating'
+        with django_assert_num_queries(2) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert all(set(title) == {'id', 'name', 'rating'}
+                   for title in results), (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert {title['rating'] for title in results} == {None, 8}
+        sql = context.captured_queries[-1]['sql']
+        assert 'description' not in sql and 'reviews_category' not in sql, (
+            'Проверьте, что при запросе части полей queryset не загружает '
+            'лишние колонки и связанные таблицы.'
+        )
+
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?exclude=genre,description'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'category', 'rating'
+        }
+
+    def test_02_reviews_comments_users_fields(self, admin_client, user,
+                                              moderator, user_client,
+                                              moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url, fields in (
+            (f'{url}?fields=id,score', {'id', 'score'}),
+            (f'{url}{reviews[0]["id"]}/comments/?exclude=pub_date,review',
+             {'id', 'text', 'author'}),
+            ('/api/v1/users/?fields=username', {'username'}),
+            ('/api/v1/genres/?fields=slug', {'slug'}),
+        ):
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert all(
+                set(item) == fields for item in response.json()['results']
+            ), (
+                f'Проверьте, что GET-запрос к `{url}` возвращает только '
+                'выбранные поля.'
+            )
+
+    def test_03_unknown_field(self, client):
+        response = client.get('/api/v1/titles/?fields=id,secret')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестного поля в `fields` возвращает '
+            'ответ со статусом 400.'
+        )
+
+    def test_04_review_comment_detail_sql(self, client, admin_client, user,
+                                          user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        for url, fields, skipped in (
+            (f'{url}?fields=id,score', {'id', 'score'},
+             ('"text"', 'reviews_user')),
+            (f'{url}comments/{comments[0]["id"]}/?fields=id,text',
+             {'id', 'text'},
+             ('"pub_date"', 'reviews_user')),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert set(response.json()) == fields
+            sql = context.captured_queries[-1]['sql']
+            assert not any(name in sql for name in skipped), (
+                f'Проверьте, что GET-запрос к `{url}` не загружает лишние '
+                'колонки и связанные таблицы.'
+            )
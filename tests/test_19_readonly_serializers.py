@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.fixture
+def reviewed_titles(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        for idx in range(3)
+    ]
+    category = Category.objects.create(name='Книги', slug='books')
+    genres = [
+        Genre.objects.create(name=name, slug=f'genre{idx}')
+        for idx, name in enumerate(('Роман', 'Драма', 'Роман'))
+    ]
+    titles = [
+        Title.objects.create(
+            name=f'Произведение {idx}', year=2000 + idx,
+            description='описание' * idx,
+            category=category if idx % 2 else None,
+        )
+        for idx in range(5)
+    ]
+    for idx, title in enumerate(titles[:4]):
+        title.genre.set(genres[:idx])
+    for idx, author in enumerate(authors):
+        review = Review.objects.create(
+            title=titles[0], author=author, text=f'text {idx}', score=idx + 3
+        )
+        Comment.objects.create(review=review, author=author, text='comment')
+    return titles
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('sparse', (
+    {}, {'fields': ['id', 'name', 'rating']}, {'exclude': ['genre']},
+    {'fields': ['genre']},
+))
+def test_01_titles_output_matches(reviewed_titles, sparse):
+    from api.readonly_serializers import TitleValuesSerializer
+    from api.serializers import TitleSerializer
+    from api.views import TitleViewSet
+
+    queryset = TitleViewSet.queryset.all()
+    serializer = TitleValuesSerializer(**sparse)
+    assert render(
+        serializer.to_representation(serializer.get_values(queryset))
+    ) == render(TitleSerializer(queryset, many=True, **sparse).data), (
+        'Проверьте, что быстрый сериализатор произведений выводит те же '
+        'данные, что и TitleSerializer.'
+    )
+
+
+@pytest.mark.django_db
+def test_02_reviews_and_comments_output_matches(reviewed_titles):
+    from api.readonly_serializers import (CommentValuesSerializer,
+                                          ReviewValuesSerializer)
+    from api.serializers import CommentSerializer, ReviewSerializer
+    from reviews.models import Comment
+
+    for values_serializer, model_serializer, queryset in (
+        (ReviewValuesSerializer, ReviewSerializer,
+         reviewed_titles[0].reviews.select_related('author')),
+        (CommentValuesSerializer, CommentSerializer,
+         Comment.objects.select_related('author')),
+    ):
+        serializer = values_serializer()
+        assert render(
+            serializer.to_representation(serializer.get_values(queryset))
+        ) == render(model_serializer(queryset, many=True).data), (
+            f'Проверьте, что {values_serializer.__name__} выводит те же '
+            f'данные, что и {model_serializer.__name__}.'
+        )
+
+
+@pytest.mark.django_db
+def test_03_cursor_pagination(client, reviewed_titles):
+    url = '/api/v1/titles/?pagination=cursor&page_size=2'
+    names = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        names += [title['name'] for title in response.json()['results']]
+        url = response.json()['next']
+    assert names == sorted(title.name for title in reviewed_titles)
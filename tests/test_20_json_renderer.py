@@ -0,0 +1,70 @@
+import datetime
+import decimal
+from collections import OrderedDict
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+DATA = OrderedDict((
+    ('text', 'Текст с "кавычками" и разделителем \u2028'),
+    ('when', datetime.datetime(
+        2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc
+    )),
+    ('day', datetime.date(2024, 5, 1)),
+    ('price', decimal.Decimal('9.50')),
+    ('scores', {1: 0, 10: 2}),
+    ('lazy', gettext_lazy('Not found.')),
+    ('items', [None, True, 1.5, {'nested': []}]),
+))
+
+
+def test_01_renderer_output_matches_drf(json_library):
+    from api.renderers import FastJSONRenderer
+
+    for data in (DATA, [DATA, DATA], {}, [], 'text', None):
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data
+        ), (
+            f'Проверьте, что FastJSONRenderer ({json_library}) выводит тот '
+            'же JSON, что и JSONRenderer.'
+        )
+    indented = 'application/json; indent=4'
+    assert FastJSONRenderer().render(
+        DATA, indented
+    ) == JSONRenderer().render(DATA, indented)
+
+
+@pytest.mark.django_db
+def test_02_parser(admin_client):
+    response = admin_client.post(
+        '/api/v1/genres/',
+        data='{"name": "Жанр", "slug": "genre"',
+        content_type='application/json',
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        'Проверьте, что некорректный JSON в теле запроса возвращает ответ '
+        'со статусом 400.'
+    )
+    response = admin_client.post(
+        '/api/v1/genres/',
+        data='{"name": "Жанр", "slug": "genre"}'.encode('cp1251'),
+        content_type='application/json; charset=cp1251',
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json() == {'name': 'Жанр', 'slug': 'genre'}
+    for charset in ('utf-16', 'unknown-charset'):
+        response = admin_client.post(
+            '/api/v1/genres/',
+            data=b'{"name": "x"}',
+            content_type=f'application/json; charset={charset}',
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что тело, которое не удается декодировать в '
+            f'кодировке {charset}, возвращает ответ со статусом 400.'
+        )
@@ -0,0 +1,102 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+from django.test import RequestFactory
+
+from tests.utils import create_titles
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.parametrize('header, expected', (
+    ('gzip, deflate', 'gzip'),
+    ('deflate;q=1, gzip;q=0.5', 'gzip'),
+    ('gzip;q=0', None),
+    ('*', 'gzip'),
+    ('*;q=0, identity', None),
+    ('', None),
+))
+def test_01_negotiate(header, expected, monkeypatch):
+    from api import compression
+
+    monkeypatch.setattr(compression, 'brotli', None)
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header)
+    assert compression.negotiate(request) == expected
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Compression:
+
+    url = '/api/v1/titles/'
+
+    @pytest.fixture(autouse=True)
+    def gzip_only(self, monkeypatch, settings):
+        from api import compression
+
+        monkeypatch.setattr(compression, 'brotli', None)
+        settings.RESPONSE_COMPRESSION_MIN_SIZE = 200
+
+    @pytest.fixture
+    def compress_calls(self, monkeypatch):
+        from api import compression, middleware, mixins
+
+        calls = []
+
+        def counting_compress(content, encoding):
+            calls.append(encoding)
+            return compression.compress(content, encoding)
+
+        monkeypatch.setattr(middleware, 'compress', counting_compress)
+        monkeypatch.setattr(mixins, 'compress', counting_compress)
+        return calls
+
+    def test_02_threshold_and_negotiation(self, client, admin_client,
+                                          django_user_model):
+        response = client.get('/api/v1/genres/', HTTP_ACCEPT_ENCODING='gzip')
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы короче порога не сжимаются.'
+        )
+        create_titles(admin_client)
+        plain = client.get(self.url)
+        assert not plain.has_header('Content-Encoding')
+        assert 'Accept-Encoding' in plain['Vary']
+
+        response = client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что ответ сжимается, если клиент принимает gzip.'
+        )
+        assert gzip.decompress(response.content) == plain.content
+        assert len(response.content) < len(plain.content)
+
+        for idx in range(5):
+            django_user_model.objects.create_user(
+                username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+            )
+        response = admin_client.get(
+            '/api/v1/users/', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что сжимаются и ответы без кеширования.'
+        )
+
+    def test_03_cache_stores_compressed_body(self, client, admin_client,
+                                             compress_calls):
+        create_titles(admin_client)
+        compress_calls.clear()
+        first = client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        second = client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        assert second['Content-Encoding'] == 'gzip'
+        assert second.content == first.content
+        assert compress_calls == ['gzip'], (
+            'Проверьте, что кеш хранит сжатое тело ответа и при повторном '
+            'запросе оно не сжимается заново.'
+        )
+        assert second['ETag'].startswith('W/')
+        response = client.get(
+            self.url, HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=second['ETag']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert not client.get(self.url).has_header('Content-Encoding')
@@ -0,0 +1,52 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Настройки PRAGMA только для SQLite'
+    ),
+]
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    """Новое подключение к файлу SQLite с настройками основной базы."""
+    default = connections['default']
+    settings_dict = {
+        **default.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')
+    }
+    wrapper = default.__class__(settings_dict, alias='pragmas')
+    yield wrapper
+    wrapper.close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def test_01_pragmas_applied_on_connect(file_connection, settings):
+    settings.SQLITE_PRAGMAS = {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'busy_timeout': 7000,
+        'cache_size': -4000,
+        'temp_store': 'memory',
+    }
+    assert pragma(file_connection, 'journal_mode') == 'wal', (
+        'Проверьте, что при подключении к SQLite включается режим WAL.'
+    )
+    assert pragma(file_connection, 'synchronous') == 1
+    assert pragma(file_connection, 'busy_timeout') == 7000
+    assert pragma(file_connection, 'cache_size') == -4000
+    assert pragma(file_connection, 'temp_store') == 2
+
+
+def test_02_invalid_pragma(file_connection, settings):
+    settings.SQLITE_PRAGMAS = {'journal_mode': 'wal; DROP TABLE x'}
+    with pytest.raises(ImproperlyConfigured):
+        file_connection.ensure_connection()
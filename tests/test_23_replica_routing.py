@@ -0,0 +1,143 @@
+import time
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+def count_queries(client, url, alias):
+    with CaptureQueriesContext(connections[alias]) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+class Test23ReplicaRouting:
+
+    def test_01_safe_requests_read_from_replica(self, client, admin_client,
+                                                replica):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'text', 5)
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{title_id}/',
+                    '/api/v1/genres/', '/api/v1/categories/',
+                    f'/api/v1/titles/{title_id}/reviews/'):
+            with CaptureQueriesContext(connections['default']) as primary:
+                assert count_queries(client, url, replica), (
+                    f'Проверьте, что GET-запрос к `{url}` читает из реплики.'
+                )
+            assert not primary.captured_queries, (
+                f'Проверьте, что GET-запрос к `{url}` не обращается к '
+                'основной базе.'
+            )
+
+    def test_02_writes_and_admin_views_use_primary(self, admin_client,
+                                                   replica):
+        with CaptureQueriesContext(connections[replica]) as context:
+            create_titles(admin_client)
+            response = admin_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK
+        assert not context.captured_queries, (
+            'Проверьте, что запись и запросы к пользователям идут в основную '
+            'базу.'
+        )
+
+    def test_03_read_your_writes(self, admin_client, user_client, client,
+                                 replica, settings):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        assert not count_queries(user_client, url, replica), (
+            'Проверьте, что после записи пользователь читает из основной '
+            'базы.'
+        )
+        assert count_queries(client, url, replica), (
+            'Проверьте, что запись одного пользователя не отключает реплику '
+            'для остальных.'
+        )
+
+        settings.REPLICA_STICKY_SECONDS = 0
+        response = user_client.patch(
+            f'{url}{response_review_id(user_client, url)}/', {'score': 6}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert count_queries(user_client, url, replica), (
+            'Проверьте, что по истечении REPLICA_STICKY_SECONDS чтение '
+            'возвращается в реплику.'
+        )
+
+    def test_04_router(self, admin_client, replica):
+        from api.routers import ReplicaRouter, use_replica
+        from reviews.models import Category
+
+        create_titles(admin_client)
+        router = ReplicaRouter()
+        assert router.db_for_read(Category) == 'default'
+        token = use_replica.set(True)
+        try:
+            assert router.db_for_read(Category) == replica
+            category = Category.objects.first()
+        finally:
+            use_replica.reset(token)
+        assert category._state.db == replica
+        assert router.db_for_write(Category, instance=category) == 'default'
+        assert not router.allow_migrate(replica, 'reviews')
+
+
+def response_review_id(client, url):
+    return client.get(url).json()['results'][0]['id']
+
+
+def sync_replica(alias):
+    for name in ('default', alias):
+        connections[name].ensure_connection()
+    connections['default'].connection.backup(connections[alias].connection)
+
+
+def review_texts(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [review['text'] for review in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True,
+                       databases=['default', 'replica_file'])
+class Test23LaggingReplica:
+
+    def test_01_replica_responses_cached_briefly(
+            self, admin_client, user_client, client, replica_file,
+            settings):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        sync_replica(replica_file)
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+
+        response = client.get(url)
+        assert response.json()['results'] == []
+        assert not response.has_header('ETag'), (
+            'Проверьте, что ответ из реплики не получает ETag по версиям '
+            'основной базы.'
+        )
+        assert review_texts(user_client, url) == ['text'], (
+            'Проверьте, что ответ из отстающей реплики не отдается '
+            'пользователю, который читает из основной базы после записи.'
+        )
+        sync_replica(replica_file)
+        with CaptureQueriesContext(connections[replica_file]) as context:
+            assert review_texts(client, url) == []
+        assert not context.captured_queries, (
+            'Проверьте, что ответы из реплики кешируются.'
+        )
+        expired = time.time() + settings.REPLICA_STICKY_SECONDS + 1
+        with mock.patch('time.time', return_value=expired):
+            assert review_texts(client, url) == ['text'], (
+                'Проверьте, что ответ из реплики хранится в кеше не дольше '
+                '`REPLICA_STICKY_SECONDS` секунд.'
+            )
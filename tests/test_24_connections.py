@@ -0,0 +1,57 @@
+import pytest
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+
+@pytest.fixture
+def connection_settings():
+    saved = dict(connection.settings_dict)
+    yield connection.settings_dict
+    connection.settings_dict.update(saved)
+
+
+def request_cycle():
+    request_started.send(sender=None)
+    connection.ensure_connection()
+    raw = connection.connection
+    request_finished.send(sender=None)
+    return raw
+
+
+def test_00_settings():
+    from django.conf import settings
+
+    for alias, database in settings.DATABASES.items():
+        assert 'CONN_MAX_AGE' in database, (
+            f'Проверьте, что для базы `{alias}` задан CONN_MAX_AGE.'
+        )
+        assert 'CONN_HEALTH_CHECKS' in database
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Connections:
+
+    def test_01_persistent_connection(self, connection_settings):
+        connection_settings['CONN_MAX_AGE'] = 60
+        connection.close()
+        assert request_cycle() is request_cycle(), (
+            'Проверьте, что при CONN_MAX_AGE > 0 подключение '
+            'переиспользуется между запросами.'
+        )
+
+    @pytest.mark.parametrize('health_checks', (True, False))
+    def test_02_health_check(self, connection_settings, monkeypatch,
+                             health_checks):
+        from reviews.signals import close_unusable_connections
+
+        connection_settings['CONN_HEALTH_CHECKS'] = health_checks
+        connection.ensure_connection()
+        closed = []
+        # Тестовая база в памяти не закрывается, поэтому фиксируется вызов.
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+        close_unusable_connections(sender=None)
+        assert bool(closed) is health_checks, (
+            'Проверьте, что перед запросом разорванное подключение '
+            'закрывается, если включен CONN_HEALTH_CHECKS.'
+        )
@@ -0,0 +1,85 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from tests.utils import create_comments
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+def async_get(url, **headers):
+    # AsyncClient в Django 3.2 передает именованные аргументы как
+    # заголовки с тем же именем, а не как ключи META.
+    return async_to_sync(AsyncClient().get)(url, **headers)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AsyncViews:
+
+    def test_01_same_responses(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        for path in (
+            'titles/', f'titles/{title_id}/', 'titles/?year=1984&page=1',
+            f'titles/{title_id}/reviews/',
+            f'titles/{title_id}/reviews/{review_id}/',
+            f'titles/{title_id}/reviews/{review_id}/comments/',
+        ):
+            # Асинхронный запрос первым, чтобы ответ не взялся из кеша.
+            response = async_get(f'/api/v1/async/{path}')
+            expected = client.get(f'/api/v1/{path}')
+            assert response.status_code == expected.status_code
+            assert response.json() == expected.json(), (
+                f'Проверьте, что `/api/v1/async/{path}` возвращает то же, '
+                f'что и `/api/v1/{path}`.'
+            )
+
+    def test_02_cached_and_not_modified(self, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id = titles[0]['id']
+        for path in (
+            'titles/', f'titles/{title_id}/', f'titles/{title_id}/reviews/',
+            f'titles/{title_id}/reviews/{reviews[0]["id"]}/comments/',
+        ):
+            url = f'/api/v1/async/{path}'
+            first = async_get(url)
+            assert first.status_code == HTTPStatus.OK
+            second = async_get(url)
+            assert second.status_code == HTTPStatus.OK, (
+                f'Проверьте, что повторный запрос к `{url}` возвращает '
+                'ответ из кеша со статусом 200.'
+            )
+            assert second.json() == first.json()
+            response = async_get(
+                url, **{'If-None-Match': first['ETag']}
+            )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что условный запрос к `{url}` с актуальным '
+                'ETag возвращает ответ со статусом 304.'
+            )
+
+    def test_03_read_only(self):
+        response = async_to_sync(AsyncClient().post)(
+            '/api/v1/async/titles/', {'name': 'Title', 'year': 2000}
+        )
+        assert response.status_code in (
+            HTTPStatus.UNAUTHORIZED, HTTPStatus.METHOD_NOT_ALLOWED
+        )
+        assert async_get('/api/v1/async/titles/100500/').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+
+    def test_04_views_are_coroutines(self):
+        from api import async_views
+
+        for name in ('title_list', 'title_detail', 'review_list',
+                     'review_detail', 'comment_list', 'comment_detail'):
+            assert asyncio.iscoroutinefunction(getattr(async_views, name))
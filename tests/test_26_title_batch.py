@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+pytestmark = pytest.mark.usefixtures('json_library')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TitleBatch:
+
+    def test_01_order_and_content(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = (title['id'] for title in titles)
+        details = {
+            pk: client.get(f'/api/v1/titles/{pk}/').json()
+            for pk in (first, second)
+        }
+        for ids in ((first, second), (second, first)):
+            query = ','.join(map(str, (*ids, ids[0], 100500)))
+            response = client.get(f'/api/v1/titles/?ids={query}')
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == [details[pk] for pk in ids], (
+                'Проверьте, что `/api/v1/titles/?ids=` возвращает список '
+                'произведений в порядке запроса, без повторов и '
+                'несуществующих id.'
+            )
+        response = client.get(
+            f'/api/v1/titles/?ids={second},{first}&fields=name'
+        )
+        assert response.json() == [
+            {'name': details[pk]['name']} for pk in (second, first)
+        ]
+
+    def test_02_queries(self, client, admin_client,
+                        django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        query = ','.join(str(title['id']) for title in titles)
+        # Произведения с категориями и жанры всех произведений.
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/?ids={query}')
+        assert len(response.json()) == len(titles)
+
+    @pytest.mark.parametrize('ids', ('', 'a,b', '1,,x', '1,2,3'))
+    def test_03_invalid(self, client, settings, ids):
+        settings.TITLE_BATCH_MAX_IDS = 2
+        response = client.get(f'/api/v1/titles/?ids={ids}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пустой, некорректный или слишком длинный '
+            'список `ids` возвращает ответ со статусом 400.'
+        )
+        assert 'ids' in response.json()